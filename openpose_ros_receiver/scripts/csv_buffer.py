@@ -0,0 +1,24 @@
+#!/usr/bin/env python
+
+# python modules
+from collections import OrderedDict
+
+
+# Buffer CSV lines per output file in memory and write every file once, on flush
+class BufferedCsvWriter(object):
+
+    def __init__(self):
+        self.buffers = OrderedDict()
+
+    # Queue a line (including its newline) for the given file
+    def write(self, path, line):
+        if path not in self.buffers:
+            self.buffers[path] = []
+        self.buffers[path].append(line)
+
+    # Write the queued lines, one open/write/close per file, and empty the buffers
+    def flush(self, mode='a'):
+        for path, lines in self.buffers.items():
+            with open(path, mode) as fp:
+                fp.write("".join(lines))
+        self.buffers.clear()
@@ -2,14 +2,25 @@
 
 # python modules
 import os
-import re
 import math
+import multiprocessing
 import time
 import numpy as np
-from scipy import stats as stats
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-import seaborn as sns
+
+# local modules
+import log_cache
+import log_index
+import csv_buffer
+import streaming_stats
+import stats_engine
+import keypoint_models
+import plot_renderer
+import run_archive
+
+# plotting modules, imported by the first plot that is drawn
+plt = plot_renderer.LazyModule("matplotlib.pyplot")
+mplot3d = plot_renderer.LazyModule("mpl_toolkits.mplot3d")
+sns = plot_renderer.LazyModule("seaborn")
 
 
 # Get a list of keys from dictionary which has the given value
@@ -33,48 +44,81 @@ def reorderList(lst, rule, values=None):
     return new_list, new_values
 
 
+# Parse the log files of a scenario folder, write its CoordsAndProb CSVs, unless csvs_folder_path is None, and return its [frame][keypoint][element] frames
+def ingestScenario(scenarios_logs_subfolder_path, part, elem, name_to_index, csvs_folder_path, cache_folder_path):
+    # source: https://stackoverflow.com/questions/678236/how-to-get-the-filename-without-the-extension-from-a-path-in-python
+    scenario_name = os.path.splitext(os.path.basename(scenarios_logs_subfolder_path))[0]
+
+    # take the scenario's log files in time order, from its log index
+    index = log_index.indexLogFolder(scenarios_logs_subfolder_path, cache_folder_path + scenario_name + "_index.npz")
+    log_files = [ index.path(k) for k in index.select() ]
+
+    # buffer each keypoint line for the appropriate CSV
+    coords_and_prob_csvs = csv_buffer.BufferedCsvWriter()
+    def writeCoordsAndProb(body_part, coords_and_prob):
+        coords_and_prob_csvs.write(csvs_folder_path + scenario_name + "/" + body_part + "CoordsAndProb" + ".csv", ",".join(coords_and_prob) + "\n")
+
+    # parse the log files block by block, or load them from the cache if they are unchanged, into growable storage
+    frames = streaming_stats.ChunkedArray((part, elem))
+    for block in log_cache.iterLogFiles(log_files, part, elem, name_to_index, cache_folder_path + scenario_name + ".npz", on_line=writeCoordsAndProb if csvs_folder_path else None):
+        frames.append(block)
+
+    # write the scenario's CSVs, once per file
+    coords_and_prob_csvs.flush()
+
+    return scenario_name, frames.toArray()
+
+
+# Unpack a job tuple for ingestScenario, as a pool maps a single argument
+def ingestScenarioJob(job):
+    return ingestScenario(*job)
+
+
+# Read a ground truth table of "Scenario,Keypoint,x,y,z" rows, after a header line, into a [Scenario][BodyPart][x/y/z] array, over the positions it already holds
+def readGroundTruth(path, ground_truth, scenarios_index, name_to_index):
+    with open(path) as fp:
+        for line in fp.read().splitlines()[1:]:
+            if not line.strip():
+                continue
+            scenario, keypoint, x, y, z = [ e.strip() for e in line.split(",") ]
+            ground_truth[ scenarios_index[scenario], name_to_index[keypoint] ] = [ float(x), float(y), float(z) ]
+    return ground_truth
+
+
+# Compare keypoints between pairs of scenarios, e.g. under clear and overlapping conditions, in a [Scenario][BodyPart][x/y/z][t0,...,tN] tensor.
+# Each pair's keypoints are gathered once and kept at the frames where both scenarios have all of their coordinates, then each normalization's
+# [Scenario][BodyPart][x/y/z] offsets are subtracted from them. Returns [pair][normalization][keypoint] lists of the x, y, z of either scenario in turn
+def compareScenarioPairs(keypoints_xyz, pairs_idx, keypoints_idx, offsets):
+    comparisons = []
+    for pair_idx in pairs_idx:
+        # [first/second][keypoint][x/y/z][t0,...,tN], and the [keypoint][t0,...,tN] joint mask of the frames to keep
+        gathered = keypoints_xyz[pair_idx][:, keypoints_idx]
+        kept = ~np.isnan(gathered).any(axis=(0, 2))
+
+        pair_comparisons = []
+        for offset in offsets:
+            normalized = gathered - offset[pair_idx][:, keypoints_idx][:, :, :, np.newaxis]
+            pair_comparisons.append([ [ normalized[s, k, e][ kept[k] ].tolist() for e in range(3) for s in range(2) ] for k in range(len(keypoints_idx)) ])
+        comparisons.append(pair_comparisons)
+    return comparisons
+
+
 # Define a function for a 3D multi-scatterplot
 def multiscatterplot3D(data, directory, names=None, x_label=None, y_label=None, z_label=None, title=None, x_lim_min=None, x_lim_max=None, y_lim_min=None, y_lim_max=None, z_lim_min=None, z_lim_max=None, borders=False, border_1_idx=None, border_2_idx=None):
-    # print border_1_idx, border_2_idx
     fig = plt.figure()
     ax = fig.add_subplot(111)
     ax = fig.gca(projection='3d')
+    # one collection per group of [x, y, z] points: up to border_1_idx, before border_2_idx and the rest, each named after names[group]
+    points = np.asarray(data, dtype=np.float64).reshape(-1, 3)
     if borders:
-        if names:
-            b = 0
-            for d, name in zip(data, names):
-                # print d, name
-                x, y, z = d
-                if b <= border_1_idx:
-                    # print b, x, y, z, "pre_borders"
-                    ax.scatter(x, y, z, marker='*', label=name, c='blue')
-                elif b < border_2_idx:
-                    # print b, x, y, z, "border_1_idx"
-                    ax.scatter(x, y, z, marker="^", label=name, c='green')
-                else:
-                    # print b, x, y, z, "border_2_idx"
-                    ax.scatter(x, y, z, marker='o', label=name, c='red')
-                b = b + 1
-        else:
-            b = 0
-            for d in data:
-                x, y, z = d
-                if b <= border_1_idx:
-                    ax.scatter(x, y, z, marker='*', c='blue')
-                elif b < border_2_idx:
-                    ax.scatter(x, y, z, marker="^", c='green')
-                else:
-                    ax.scatter(x, y, z, marker='o', c='red')
-                b = b + 1
+        groups = [ (slice(0, border_1_idx+1), '*', 'blue'), (slice(border_1_idx+1, border_2_idx), "^", 'green'), (slice(border_2_idx, len(points)), 'o', 'red') ]
     else:
+        groups = [ (slice(0, len(points)), 'o', 'blue') ]
+    for g, (rows, marker, color) in enumerate(groups):
         if names:
-            for d, name in zip(data, names):
-                x, y, z = d
-                ax.scatter(x, y, z, marker='o', label=name, c='blue')
+            ax.scatter(points[rows, 0], points[rows, 1], points[rows, 2], marker=marker, label=names[g], c=color)
         else:
-            for d in data:
-                x, y, z = d
-                ax.scatter(x, y, z, marker='o', c='blue')
+            ax.scatter(points[rows, 0], points[rows, 1], points[rows, 2], marker=marker, c=color)
     if x_label:
         ax.set_xlabel(x_label, fontsize=8)
     if y_label:
@@ -101,20 +145,6 @@ def multiscatterplot3D(data, directory, names=None, x_label=None, y_label=None,
     plt.close(fig)
 
 
-# Simulate a function for a boxplot to find mins and maxes of caps
-def simboxplot(data):
-    if not data:
-        return
-    fig = plt.figure()
-    ax = fig.add_subplot(111)
-    data_dict = ax.boxplot(data)
-    temp_y_lim_min = np.nanmin([c.get_ydata()[0] for c in data_dict["caps"]])    # caps: the horizontal lines at the ends of the whiskers.
-    temp_y_lim_max = np.nanmax([c.get_ydata()[0] for c in data_dict["caps"]])    # caps: the horizontal lines at the ends of the whiskers.
-    plt.close(fig)
-
-    return temp_y_lim_min, temp_y_lim_max
-
-
 # Define a function for a boxplot
 def boxplot(data, directory, data_label=None, y_label=None, title=None, x_tick_labels=None, y_lim_min=None, y_lim_max=None, optimize_lims=False):
     if not data:
@@ -130,6 +160,9 @@ def boxplot(data, directory, data_label=None, y_label=None, title=None, x_tick_l
         ax.set_xticklabels(x_tick_labels, rotation=45, ha="right", fontsize=8)
     if title:
         ax.set_title(title, fontsize=10)
+    # fit the limits to the whisker caps, unless they are given
+    if optimize_lims and y_lim_min is None and y_lim_max is None:
+        y_lim_min, y_lim_max = stats_engine.whiskerLimits(data)
     if y_lim_min and y_lim_max and y_lim_min != y_lim_max:
         # to distance a bit the margins of the plot from the caps
         if optimize_lims:
@@ -146,26 +179,13 @@ def boxplot(data, directory, data_label=None, y_label=None, title=None, x_tick_l
 
 
 if __name__ == "__main__":
-    # expand the color palette for the plots, once and for all
-    sns.set_palette(sns.color_palette("hls", 25))
+    # expand the color palette for the plots, once and for all, as soon as they are drawn
+    plot_renderer.afterLoading(lambda: sns.set_palette(sns.color_palette("hls", 25)))
 
     # Body 25 human pose model specific variables
-    body_25_body_parts_dict = dict([ (0,  "Nose"), (1,  "Neck"), (2,  "RShoulder"), (3,  "RElbow"), (4,  "RWrist"),
-                                     (5,  "LShoulder"), (6,  "LElbow"), (7,  "LWrist"), (8,  "MidHip"), (9,  "RHip"),
-                                     (10, "RKnee"), (11, "RAnkle"), (12, "LHip"), (13, "LKnee"), (14, "LAnkle"),
-                                     (15, "REye"), (16, "LEye"), (17, "REar"), (18, "LEar"), (19, "LBigToe"),
-                                     (20, "LSmallToe"), (21, "LHeel"), (22, "RBigToe"), (23, "RSmallToe"), (24, "RHeel"),
-                                     (25, "Background")
-                                    ])
-    body_25_body_part_pairs = [ [1, 8], [1, 2], [1, 5], [2, 3], [3, 4], [5, 6], [6, 7],
-                                [8, 9], [9, 10], [10, 11], [8, 12], [12, 13], [13, 14], [1, 0],
-                                [0, 15], [15, 17], [0, 16], [16, 18], [14, 19],
-                                [19, 20], [14, 21], [11, 22], [22, 23], [11, 24]
-                            ]
-    body_25_body_parts_LR_order_of_appearance = [ '4', '23', '3', '22', '11', '2', '10', '9', '24', '17', '15', '8', '1', '0', '16', '18', '21', '12', '13', '14', '19', '5', '6', '20', '7' ]
-    body_25_upper_body_parts_LR_order_of_appearance = [ '4', '3', '2', '09', '17', '15', '8', '1', '0', '16', '18', '12', '5', '6', '7' ]
-    body_25_body_parts_UL_order_of_appearance = [ '15', '16', '17', '18', '0', '2', '5', '1', '3', '6', '4', '7', '9', '12', '8', '10', '13', '11', '14', '24', '21', '23', '20', '22', '19' ]
-    body_25_upper_body_parts_UL_order_of_appearance = [ '15', '16', '17', '18', '0', '2', '5', '1', '3', '6', '4', '7', '9', '12', '8' ]
+    body_25_model = keypoint_models.BODY_25
+    body_25_body_parts_dict = body_25_model.parts_dict
+    body_25_body_parts_UL_order_of_appearance = body_25_model.orders["UL"]
 
     # OpenPose specific variables
     element_dict = dict([ (0, "x"), (1, "y"), (2, "z")])
@@ -179,6 +199,8 @@ if __name__ == "__main__":
                             (25, "E-SV-ST-H-C-up"), (26, "E-SV-ST-H-C-front")
                         ])
     complementary_scenarios_c_o_pairs = [ ["A-FV-ST-H-C", "A-FV-ST-H-O"], ["B-FV-ST-H-C", "B-FV-ST-H-O"], ["E-FV-ST-H-C", "E-FV-ST-H-O"] ]
+    comparison_keypoints = [ "RWrist" ]     # keypoints whose coordinates are compared between complementary scenarios
+    keypoint_labels_dict = dict([ ("RWrist", "Right Wrist") ])
     cube_dimensions_dict = dict([ ("l", 0.093), ("w", 0.093), ("h", 0.07) ])
     ground_truth_dict = dict([ ("A", [-0.35, -0.35, 0.09]), ("A-right", [-0.257, -0.35, 0.09]), ("A-up", [-0.35, -0.35, 0.16]), ("A-front", [-0.35, -0.275, 0.09]),
                                ("B", [-0.15, -0.185, 0.09]),
@@ -199,27 +221,36 @@ if __name__ == "__main__":
     plots_folder_path = scenarios_path + "evaluation_plots/"
     statistics_folder_path = scenarios_path + "evaluation_statistics/"
     csvs_folder_path = scenarios_path + "evaluation_csvs/"
-
-    # create our 4d report matrix, e.g. for 10 log frames at 10 scenarios: [Scenario][BodyPart][x/y/z][t0,...,t9,mean,nobs,min,max,variance,skewness,kurtosis,std_dev] --> 10 * 25 * 4 * 18
-    ''''''
-    # max_logs = 10
-    # scenarios, part, elem, val = 27, 25, 3, 18
-    # stat_analysis_idx, nobs_idx, min_idx, max_idx, mean_idx, variance_idx, skewness_idx, kurtosis_idx, std_dev_idx = 10, 10, 11, 12, 13, 14, 15, 16, 17
-    ''''''
-    # max_logs = 15
-    # scenarios, part, elem, val = 27, 25, 3, 23
-    # stat_analysis_idx, nobs_idx, min_idx, max_idx, mean_idx, variance_idx, skewness_idx, kurtosis_idx, std_dev_idx = 15, 15, 16, 17, 18, 19, 20, 21, 22
-    ''''''
-    max_logs = 40
-    scenarios, part, elem, val = 27, 25, 3, 48
-    stat_analysis_idx, nobs_idx, min_idx, max_idx, mean_idx, variance_idx, skewness_idx, kurtosis_idx, std_dev_idx = 40, 40, 41, 42, 43, 44, 45, 46, 47
-    ''''''
-    
-    right_wrist_idx = getKeysByValue(body_25_body_parts_dict, "RWrist")[0]
-    report_matrix = [ [ [ [ np.nan for l in range(val) ] for k in range(elem) ] for j in range(part) ] for i in range(scenarios) ]
+    cache_folder_path = scenarios_path + "evaluation_cache/"
+    archive_path = scenarios_path + "evaluation" + run_archive.archiveExtension()
+    ground_truth_path = scenarios_path + "ground_truth.csv"   # optional "Scenario,Keypoint,x,y,z" table of the fixtures' positions, besides the right wrist's below
+    archive_output = False      # set to True to also write the frames, statistics and z-table of every scenario to a single archive file
+    export_csvs = True          # set to False to skip the per-keypoint CSVs of every scenario, e.g. when the archive replaces them
+
+    # Ingestion specific variables
+    ingest_workers = multiprocessing.cpu_count()   # set to 1 to parse the scenario folders serially
+
+    # Ground truth evaluation specific variables
+    error_percentiles = [ 90, 95 ]      # percentiles of the keypoints' distances from their ground truth to report
+    pck_radii = [ 0.02, 0.05, 0.1 ]     # radii, in meters, within which a keypoint counts as correctly estimated
+
+    # Plotting specific variables
+    plot_workers = multiprocessing.cpu_count()   # set to 1 to render the plots serially
+    stats_only = False                           # set to True to only write the CSVs and statistics, without ever importing the plotting stack
+    plot_cache = True                            # set to False to re-render even the plots whose inputs did not change
+    plots = plot_renderer.PlotRenderer(workers=plot_workers, enabled=not stats_only, cache_path=cache_folder_path + "plots.npz" if plot_cache else None)
+
+    # our 4d report matrix grows with the log frames of the longest scenario: [Scenario][BodyPart][x/y/z][t0,...,tN] --> 27 * 25 * 3 * N,
+    # while the statistics of each scenario's body part elements are reduced over the whole tensor: nobs,min,max,mean,variance,skewness,kurtosis,std_dev
+    scenarios, part, elem = 27, 25, 3
+    elem_axis, frame_axis = 2, 3
+    statistics_names = stats_engine.statistics_names
+
+    right_wrist_idx = body_25_model.index["RWrist"]
+    body_25_body_parts_index = body_25_model.index
 
     # create plots directory
-    if not os.path.exists(plots_folder_path):
+    if not stats_only and not os.path.exists(plots_folder_path):
         os.makedirs(plots_folder_path)
 
     # create statistics directory
@@ -227,11 +258,15 @@ if __name__ == "__main__":
         os.makedirs(statistics_folder_path)
 
     # create csvs directory
-    if not os.path.exists(csvs_folder_path):
+    if export_csvs and not os.path.exists(csvs_folder_path):
         os.makedirs(csvs_folder_path)
 
+    # create cache directory, before the scenario folders are indexed into it
+    if not os.path.exists(cache_folder_path):
+        os.makedirs(cache_folder_path)
+
     # create CSVs for each scenario
-    for key, value in scenarios_dict.items():
+    for key, value in (scenarios_dict.items() if export_csvs else []):
         csvs_subfolder_path = csvs_folder_path + value + "/"
         # create csvs subdirectory
         if not os.path.exists(csvs_subfolder_path):
@@ -249,344 +284,135 @@ if __name__ == "__main__":
     fp.close()
     fp = open(statistics_folder_path + "right_wrist_statistics.csv", 'w')
     fp.close()
+    fp = open(statistics_folder_path + "ground_truth_statistics.csv", 'w')
+    fp.close()
 
-    # access the files of the folders of the logs directory
-    scenario = 0
+    # access the folders of the logs directory
+    scenario_jobs = []
     for file in os.listdir(scenarios_logs_path):
+        if not os.path.isfile(os.path.join(scenarios_logs_path, file)):
+            scenario_jobs.append((os.path.join(scenarios_logs_path, file), part, elem, body_25_body_parts_index, csvs_folder_path if export_csvs else None, cache_folder_path))
+
+            if len(scenario_jobs) == scenarios:
+                break
+
+    # ingest each scenario folder, in a pool of worker processes if more than one worker is requested
+    if ingest_workers > 1:
+        pool = multiprocessing.Pool(processes=ingest_workers)
         try:
-            if not os.path.isfile(os.path.join(scenarios_logs_path, file)):
-                scenarios_logs_subfolder_path = os.path.join(scenarios_logs_path, file)
-                
-                file_counter = 0
-                for subfile in os.listdir(scenarios_logs_subfolder_path):
-                    try:
-                        if os.path.isfile(os.path.join(scenarios_logs_subfolder_path, subfile)):
-                            # read from file
-                            with open( os.path.join(scenarios_logs_subfolder_path, subfile), 'r' ) as fp:
-                                
-                                for cnt, line in enumerate(fp):
-                                    if "Body" not in line and line.strip():     # ignore header lines and empty lines
-                                        body_part = re.search('kp (.*):', line).group(1)
-                                        # source: https://stackoverflow.com/questions/678236/how-to-get-the-filename-without-the-extension-from-a-path-in-python
-                                        coords_and_prob = re.findall(r'[-+]?\d+\.\d+', line)
-
-                                        # write in the appropriate CSV
-                                        with open(csvs_folder_path + os.path.splitext(os.path.basename(scenarios_logs_subfolder_path))[0] + "/" + body_part + "CoordsAndProb" + ".csv", 'a') as fp:
-                                            string = ""
-                                            coord_or_prob_idx = 0
-                                            for i in coords_and_prob:
-                                                if string.strip():
-                                                    string = string + ","
-                                                string = string + str(i)
-
-                                                # fill report matrix
-                                                report_matrix[ getKeysByValue(scenarios_dict, os.path.splitext(os.path.basename(scenarios_logs_subfolder_path))[0])[0] ][ getKeysByValue(body_25_body_parts_dict, body_part)[0] ][coord_or_prob_idx][file_counter] = float(i)
-
-                                                coord_or_prob_idx = coord_or_prob_idx + 1
-
-                                            string = string + "\n"
-                                            fp.write(string)
-
-                            file_counter = file_counter + 1
-
-                            if file_counter == max_logs:
-                                break
-
-                    except Exception as e:
-                        raise e
-
-                scenario = scenario + 1
-
-                if scenario == scenarios:
-                    break
-
-        except Exception as e:
-            raise e
-
-    # do statistical analysis
-    occurences_accross_frames_accross_scenarios = [ [ 0 for j in range(scenarios) ] for i in range(part) ]
+            scenario_results = pool.map(ingestScenarioJob, scenario_jobs)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        scenario_results = [ ingestScenarioJob(job) for job in scenario_jobs ]
 
-    for i in range(scenarios):
-        for j in range(part):
-            for k in range(elem):
-                # count the non-nan values
-                non_nans = (~np.isnan(report_matrix[i][j][k][0:stat_analysis_idx])).sum(0)
-                if not non_nans:
-                    continue
+    # fill each scenario's slice of the report matrix
+    logs = max([ frames.shape[0] for _, frames in scenario_results ] + [0])
+    report_matrix = np.full((scenarios, part, elem, logs), np.nan)
+    for scenario_name, frames in scenario_results:
+        report_matrix[ getKeysByValue(scenarios_dict, scenario_name)[0], :, :, 0:frames.shape[0] ] = frames.transpose(1, 2, 0)
 
-                # source: https://docs.scipy.org/doc/scipy/reference/generated/scipy.stats.describe.html
-                description = stats.describe(np.array(report_matrix[i][j][k][0:stat_analysis_idx])[~np.isnan(report_matrix[i][j][k][0:stat_analysis_idx])])
-                report_matrix[i][j][k][nobs_idx] = description.nobs
-                report_matrix[i][j][k][min_idx] = np.nanmin(report_matrix[i][j][k][0:stat_analysis_idx], axis=0)
-                report_matrix[i][j][k][max_idx] = np.nanmax(report_matrix[i][j][k][0:stat_analysis_idx], axis=0)
-                report_matrix[i][j][k][mean_idx] = description.mean
-                report_matrix[i][j][k][variance_idx] = description.variance
-                report_matrix[i][j][k][skewness_idx] = description.skewness
-                report_matrix[i][j][k][kurtosis_idx] = description.kurtosis
-                report_matrix[i][j][k][std_dev_idx] = np.std(np.array(report_matrix[i][j][k][0:stat_analysis_idx])[~np.isnan(report_matrix[i][j][k][0:stat_analysis_idx])])
+    # compute the statistics of every scenario's body part elements, at once across the log frame axis
+    statistics = stats_engine.describeTensor(report_matrix, axis=frame_axis)
 
-            # Count occurences accross log frames accross scenarios
-            occurences_accross_frames_accross_scenarios[j][i] = (~np.isnan(report_matrix[i][j][ getKeysByValue(element_dict, "x")[0] ][0:stat_analysis_idx])).sum(0)
+    # do statistical analysis, with the positions of the coordinates along the element axis looked up once
+    xyz_idx = [ getKeysByValue(element_dict, e)[0] for e in [ "x", "y", "z" ] ]
+    scenarios_index = dict( (name, i) for i, name in scenarios_dict.items() )
+    # [Scenario][BodyPart][x/y/z] ground truth, of the right wrist and of whatever the ground truth table holds, NaN elsewhere
+    ground_truth = np.full((scenarios, part, 3), np.nan)
+    ground_truth[:, right_wrist_idx] = [ right_wrist_ground_truth_dict.get(i) for i in range(scenarios) ]
+    if os.path.isfile(ground_truth_path):
+        ground_truth = readGroundTruth(ground_truth_path, ground_truth, scenarios_index, body_25_body_parts_index)
+    right_wrist_ground_truth = ground_truth[:, right_wrist_idx]
 
+    # count occurences accross log frames accross scenarios, as a [BodyPart][Scenario] table
+    occurences_accross_frames_accross_scenarios = (~np.isnan(report_matrix)).sum(axis=frame_axis)[:, :, xyz_idx[0]].T
 
-    # right wrist coords accross scenarios, with ground truth and mean value ( range(max_logs+2) )
-    right_wrist_coords = [ [ 0.0 for j in range(max_logs+2) ] for i in range(scenarios) ]
-    names = [ "t"+str(e) for e in range(max_logs) ]
-    names.append("mean")
-    names.append("GroundTruth")
 
-    # gather the necessary right wrist coordinates
-    for i in range(scenarios):
-        for j in range(max_logs+2):
-            if j == max_logs:
-                right_wrist_coords[i][j] = [ report_matrix[i][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][mean_idx], report_matrix[i][right_wrist_idx][ getKeysByValue(element_dict, "y")[0] ][mean_idx], report_matrix[i][right_wrist_idx][ getKeysByValue(element_dict, "z")[0] ][mean_idx] ]
-            elif j == max_logs + 1:
-                right_wrist_coords[i][j] = right_wrist_ground_truth_dict.get(i)
-            else:
-                right_wrist_coords[i][j] = [ report_matrix[i][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][j], report_matrix[i][right_wrist_idx][ getKeysByValue(element_dict, "y")[0] ][j], report_matrix[i][right_wrist_idx][ getKeysByValue(element_dict, "z")[0] ][j] ]
+    # gather the right wrist coordinates accross scenarios, [Scenario][x/y/z][t0,...,tN], with their means and standard deviations
+    right_wrist = np.take(report_matrix, xyz_idx, axis=elem_axis)[:, right_wrist_idx]
+    right_wrist_mean = np.take(statistics["mean"], xyz_idx, axis=elem_axis)[:, right_wrist_idx]
+    right_wrist_std_dev = np.take(statistics["std_dev"], xyz_idx, axis=elem_axis)[:, right_wrist_idx]
+
+    # right wrist coords accross scenarios, with mean value and ground truth after the frames: [Scenario][t0,...,tN,mean,gt][x/y/z]
+    right_wrist_coords = np.concatenate([ right_wrist, right_wrist_mean[:, :, np.newaxis], right_wrist_ground_truth[:, :, np.newaxis] ], axis=2).transpose(0, 2, 1)
 
     # do the plotting
     for i in range(scenarios):
-        # print "all: ", len(right_wrist_coords[i][0:max_logs+2])
-        # print right_wrist_coords[i][0:max_logs+2]
         # first, sanitize data
-        filtered = []
-        for rwc in right_wrist_coords[i]:
-            x_i, y_i, z_i = rwc[0], rwc[1], rwc[2]
-            if not np.isnan(x_i) and not np.isnan(y_i) and not np.isnan(z_i):
-                filtered.append([x_i, y_i, z_i])
-        # print "filtered: ", len(filtered)
-        # print filtered
+        filtered = right_wrist_coords[i][ ~np.isnan(right_wrist_coords[i]).any(axis=1) ]
         # second, plot them
         if len(filtered) >= 3:
-            multiscatterplot3D(
-                data=filtered,
+            plots.add(multiscatterplot3D,
+                data=filtered.tolist(),
                 directory=plots_folder_path,
                 x_label="X", y_label="Y", z_label="Z",
                 title=scenarios_dict.get(i) + " Right Wrist in space",
-                names=names,
+                names=[ "Right Wrist", "Right Wrist mean", "Right Wrist ground truth" ],
                 borders=True, border_1_idx=len(filtered)-3, border_2_idx=len(filtered)-1,
-                x_lim_min=np.min([ e[0] for e in filtered ]), x_lim_max=np.max([ e[0] for e in filtered ]),
-                y_lim_min=np.min([ e[1] for e in filtered ]), y_lim_max=np.max([ e[1] for e in filtered ]),
-                z_lim_min=np.min([ e[2] for e in filtered ]), z_lim_max=np.max([ e[2] for e in filtered ])
+                x_lim_min=filtered[:, 0].min(), x_lim_max=filtered[:, 0].max(),
+                y_lim_min=filtered[:, 1].min(), y_lim_max=filtered[:, 1].max(),
+                z_lim_min=filtered[:, 2].min(), z_lim_max=filtered[:, 2].max()
             )
 
 
-    # summary of right wrist statistics accross scenarios
-    right_wrist_stats = []
-    for i in range(scenarios):
-        right_wrist_stats.append([
-            right_wrist_ground_truth_dict.get(i)[0], right_wrist_ground_truth_dict.get(i)[1], right_wrist_ground_truth_dict.get(i)[2],
-            report_matrix[i][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][mean_idx], report_matrix[i][right_wrist_idx][ getKeysByValue(element_dict, "y")[0] ][mean_idx], report_matrix[i][right_wrist_idx][ getKeysByValue(element_dict, "z")[0] ][mean_idx],
-            report_matrix[i][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][std_dev_idx], report_matrix[i][right_wrist_idx][ getKeysByValue(element_dict, "y")[0] ][std_dev_idx], report_matrix[i][right_wrist_idx][ getKeysByValue(element_dict, "z")[0] ][std_dev_idx],
-            (right_wrist_ground_truth_dict.get(i)[0] - report_matrix[i][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][mean_idx]), (right_wrist_ground_truth_dict.get(i)[1] - report_matrix[i][right_wrist_idx][ getKeysByValue(element_dict, "y")[0] ][mean_idx]), (right_wrist_ground_truth_dict.get(i)[2] - report_matrix[i][right_wrist_idx][ getKeysByValue(element_dict, "z")[0] ][mean_idx])
-        ])
-    
-
-    # complementary scenarios coordinates boxplot comparison
-    # for each pair of complementary scenarios:
-    for i in range(len(complementary_scenarios_c_o_pairs)):
-        # take the x[], y[], z[] of each scenario
-        x1, x2, y1, y2, z1, z2 = [], [], [], [], [], []
-        scenario_1_idx, scenario_2_idx = getKeysByValue(scenarios_dict, complementary_scenarios_c_o_pairs[i][0])[0], getKeysByValue(scenarios_dict, complementary_scenarios_c_o_pairs[i][1])[0]
-        for j in range(max_logs):
-            if not np.isnan(report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][j]) and not np.isnan(report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][j]) and not np.isnan(report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "y")[0] ][j]) and not np.isnan(report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][j]) and not np.isnan(report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "z")[0] ][j]) and not np.isnan(report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][j]):
-                x1.append( report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][j] )
-                x2.append( report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][j] )
-                y1.append( report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "y")[0] ][j] )
-                y2.append( report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "y")[0] ][j] )
-                z1.append( report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "z")[0] ][j] )
-                z2.append( report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "z")[0] ][j] )
-
-        # Simulate a boxplot for each element to find mins and maxes of caps
-        mins, maxes = [], []
-        new_y_axis_min, new_y_axis_max = 0, 0
-        ret = simboxplot(data=x1)
-        if ret:
-            new_y_axis_min, new_y_axis_max = ret
-        mins.append(new_y_axis_min)
-        maxes.append(new_y_axis_max)
-        ret = simboxplot(data=x2)
-        if ret:
-            new_y_axis_min, new_y_axis_max = ret
-        mins.append(new_y_axis_min)
-        maxes.append(new_y_axis_max)
-        ret = simboxplot(data=y1)
-        if ret:
-            new_y_axis_min, new_y_axis_max = ret
-        mins.append(new_y_axis_min)
-        maxes.append(new_y_axis_max)
-        ret = simboxplot(data=y2)
-        if ret:
-            new_y_axis_min, new_y_axis_max = ret
-        mins.append(new_y_axis_min)
-        maxes.append(new_y_axis_max)
-        ret = simboxplot(data=z1)
-        if ret:
-            new_y_axis_min, new_y_axis_max = ret
-        mins.append(new_y_axis_min)
-        maxes.append(new_y_axis_max)
-        ret = simboxplot(data=z2)
-        if ret:
-            new_y_axis_min, new_y_axis_max = ret
-        mins.append(new_y_axis_min)
-        maxes.append(new_y_axis_max)
-        # find y axis min and max
-        y_axis_min = np.nanmin(mins)
-        y_axis_max = np.nanmax(maxes)
-        
-        # do the boxplotting
-        boxplot(
-            data=[x1, x2, y1, y2, z1, z2],
-            directory=plots_folder_path,
-            data_label="Right Wrist coordinates at Clear vs Overlapping conditions",
-            title=complementary_scenarios_c_o_pairs[i][0] + " vs " + complementary_scenarios_c_o_pairs[i][1] + " right wrist coordinates",
-            x_tick_labels=[ "X_c", "X_o", "Y_c", "Y_o", "Z_c", "Z_o" ],
-            y_lim_min=y_axis_min, y_lim_max=y_axis_max,
-            optimize_lims=True
-        )
+    # summary of right wrist statistics accross scenarios: [Scenario][gt, mean, std_dev, gt_dev of x/y/z]
+    right_wrist_stats = np.concatenate([ right_wrist_ground_truth, right_wrist_mean, right_wrist_std_dev, right_wrist_ground_truth - right_wrist_mean ], axis=1)
 
 
-    # repeat with median normalization
-    # complementary scenarios coordinates boxplot comparison
-    # for each pair of complementary scenarios:
-    for i in range(len(complementary_scenarios_c_o_pairs)):
-        # take the x[], y[], z[] of each scenario
-        x1, x2, y1, y2, z1, z2 = [], [], [], [], [], []
-        scenario_1_idx, scenario_2_idx = getKeysByValue(scenarios_dict, complementary_scenarios_c_o_pairs[i][0])[0], getKeysByValue(scenarios_dict, complementary_scenarios_c_o_pairs[i][1])[0]
-        for j in range(max_logs):
-            if not np.isnan(report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][j]) and not np.isnan(report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][j]) and not np.isnan(report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "y")[0] ][j]) and not np.isnan(report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][j]) and not np.isnan(report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "z")[0] ][j]) and not np.isnan(report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][j]):
-                x1.append( report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][j] - report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][mean_idx] )
-                x2.append( report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][j] - report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][mean_idx] )
-                y1.append( report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "y")[0] ][j] - report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "y")[0] ][mean_idx] )
-                y2.append( report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "y")[0] ][j] - report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "y")[0] ][mean_idx] )
-                z1.append( report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "z")[0] ][j] - report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "z")[0] ][mean_idx] )
-                z2.append( report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "z")[0] ][j] - report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "z")[0] ][mean_idx] )
-
-        # Simulate a boxplot for each element to find mins and maxes of caps
-        mins, maxes = [], []
-        ret = simboxplot(data=x1)
-        if ret:
-            new_y_axis_min, new_y_axis_max = ret
-        mins.append(new_y_axis_min)
-        maxes.append(new_y_axis_max)
-        ret = simboxplot(data=x2)
-        if ret:
-            new_y_axis_min, new_y_axis_max = ret
-        mins.append(new_y_axis_min)
-        maxes.append(new_y_axis_max)
-        ret = simboxplot(data=y1)
-        if ret:
-            new_y_axis_min, new_y_axis_max = ret
-        mins.append(new_y_axis_min)
-        maxes.append(new_y_axis_max)
-        ret = simboxplot(data=y2)
-        if ret:
-            new_y_axis_min, new_y_axis_max = ret
-        mins.append(new_y_axis_min)
-        maxes.append(new_y_axis_max)
-        ret = simboxplot(data=z1)
-        if ret:
-            new_y_axis_min, new_y_axis_max = ret
-        mins.append(new_y_axis_min)
-        maxes.append(new_y_axis_max)
-        ret = simboxplot(data=z2)
-        if ret:
-            new_y_axis_min, new_y_axis_max = ret
-        mins.append(new_y_axis_min)
-        maxes.append(new_y_axis_max)
-        # find y axis min and max
-        y_axis_min = np.nanmin(mins)
-        y_axis_max = np.nanmax(maxes)
-        
-        # do the boxplotting
-        boxplot(
-            data=[x1, x2, y1, y2, z1, z2],
-            directory=plots_folder_path,
-            data_label="Right Wrist coordinates at Clear vs Overlapping conditions with median normalization",
-            title=complementary_scenarios_c_o_pairs[i][0] + " vs " + complementary_scenarios_c_o_pairs[i][1] + " right wrist coordinates with median normalization",
-            x_tick_labels=[ "X_c", "X_o", "Y_c", "Y_o", "Z_c", "Z_o" ],
-            y_lim_min=y_axis_min, y_lim_max=y_axis_max,
-            optimize_lims=True
-        )
+    # Euclidean distance of every keypoint from its ground truth at every frame of every scenario: [Scenario][BodyPart][t0,...,tN]
+    keypoints_xyz = np.take(report_matrix, xyz_idx, axis=elem_axis)
+    ground_truth_errors = np.sqrt(((keypoints_xyz - ground_truth[:, :, :, np.newaxis]) ** 2).sum(axis=elem_axis))
+    # and their mean, median and percentiles, and the rates of frames within each radius, accross frames
+    error_nobs, error_mean, error_median, error_percentile, error_pck = stats_engine.errorSummary(ground_truth_errors, error_percentiles, pck_radii)
+
+    # summary of every keypoint's statistics accross scenarios, as the right wrist's: [Scenario][BodyPart][gt, mean, std_dev, gt_dev of x/y/z],
+    # and of its errors: [Scenario][BodyPart][mean, median, percentiles, pck rates]
+    keypoints_mean = np.take(statistics["mean"], xyz_idx, axis=elem_axis)
+    keypoints_std_dev = np.take(statistics["std_dev"], xyz_idx, axis=elem_axis)
+    ground_truth_stats = np.concatenate([ ground_truth, keypoints_mean, keypoints_std_dev, ground_truth - keypoints_mean ], axis=2)
+    error_stats = np.concatenate([ error_mean[:, :, np.newaxis], error_median[:, :, np.newaxis], error_percentile, error_pck ], axis=2)
+
 
-    
-    # repeat with ground truth normalization
-    # complementary scenarios coordinates boxplot comparison
-    # for each pair of complementary scenarios:
+    # complementary scenarios coordinates boxplot comparison, as is, with median normalization and with ground truth normalization
+    normalizations = [ ("", np.zeros_like(ground_truth)), (" with median normalization", keypoints_mean), (" post ground truth normalization", ground_truth) ]
+    pairs_idx = [ [ scenarios_index[first], scenarios_index[second] ] for first, second in complementary_scenarios_c_o_pairs ]
+    comparison_keypoints_idx = [ body_25_body_parts_index[name] for name in comparison_keypoints ]
+    comparisons = compareScenarioPairs(keypoints_xyz, pairs_idx, comparison_keypoints_idx, [ offsets for _, offsets in normalizations ])
+
+    # for each pair of complementary scenarios, normalization and keypoint:
     for i in range(len(complementary_scenarios_c_o_pairs)):
-        # take the x[], y[], z[] of each scenario
-        x1, x2, y1, y2, z1, z2 = [], [], [], [], [], []
-        scenario_1_idx, scenario_2_idx = getKeysByValue(scenarios_dict, complementary_scenarios_c_o_pairs[i][0])[0], getKeysByValue(scenarios_dict, complementary_scenarios_c_o_pairs[i][1])[0]
-        for j in range(max_logs):
-            if not np.isnan(report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][j]) and not np.isnan(report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][j]) and not np.isnan(report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "y")[0] ][j]) and not np.isnan(report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][j]) and not np.isnan(report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "z")[0] ][j]) and not np.isnan(report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][j]):
-                x1.append( report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][j] - right_wrist_ground_truth_dict.get(scenario_1_idx)[ getKeysByValue(element_dict, "x")[0] ] )
-                x2.append( report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "x")[0] ][j] - right_wrist_ground_truth_dict.get(scenario_2_idx)[ getKeysByValue(element_dict, "x")[0] ] )
-                y1.append( report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "y")[0] ][j] - right_wrist_ground_truth_dict.get(scenario_1_idx)[ getKeysByValue(element_dict, "y")[0] ] )
-                y2.append( report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "y")[0] ][j] - right_wrist_ground_truth_dict.get(scenario_2_idx)[ getKeysByValue(element_dict, "y")[0] ] )
-                z1.append( report_matrix[scenario_1_idx][right_wrist_idx][ getKeysByValue(element_dict, "z")[0] ][j] - right_wrist_ground_truth_dict.get(scenario_1_idx)[ getKeysByValue(element_dict, "z")[0] ] )
-                z2.append( report_matrix[scenario_2_idx][right_wrist_idx][ getKeysByValue(element_dict, "z")[0] ][j] - right_wrist_ground_truth_dict.get(scenario_2_idx)[ getKeysByValue(element_dict, "z")[0] ] )
-
-        # Simulate a boxplot for each element to find mins and maxes of caps
-        mins, maxes = [], []
-        ret = simboxplot(data=x1)
-        if ret:
-            new_y_axis_min, new_y_axis_max = ret
-        mins.append(new_y_axis_min)
-        maxes.append(new_y_axis_max)
-        ret = simboxplot(data=x2)
-        if ret:
-            new_y_axis_min, new_y_axis_max = ret
-        mins.append(new_y_axis_min)
-        maxes.append(new_y_axis_max)
-        ret = simboxplot(data=y1)
-        if ret:
-            new_y_axis_min, new_y_axis_max = ret
-        mins.append(new_y_axis_min)
-        maxes.append(new_y_axis_max)
-        ret = simboxplot(data=y2)
-        if ret:
-            new_y_axis_min, new_y_axis_max = ret
-        mins.append(new_y_axis_min)
-        maxes.append(new_y_axis_max)
-        ret = simboxplot(data=z1)
-        if ret:
-            new_y_axis_min, new_y_axis_max = ret
-        mins.append(new_y_axis_min)
-        maxes.append(new_y_axis_max)
-        ret = simboxplot(data=z2)
-        if ret:
-            new_y_axis_min, new_y_axis_max = ret
-        mins.append(new_y_axis_min)
-        maxes.append(new_y_axis_max)
-        # find y axis min and max
-        y_axis_min = np.nanmin(mins)
-        y_axis_max = np.nanmax(maxes)
-        
-        # do the boxplotting
-        boxplot(
-            data=[x1, x2, y1, y2, z1, z2],
-            directory=plots_folder_path,
-            data_label="Right Wrist coordinates at Clear vs Overlapping conditions post ground truth normalization",
-            title=complementary_scenarios_c_o_pairs[i][0] + " vs " + complementary_scenarios_c_o_pairs[i][1] + " right wrist coordinates post ground truth normalization",
-            x_tick_labels=[ "X_c", "X_o", "Y_c", "Y_o", "Z_c", "Z_o" ],
-            y_lim_min=y_axis_min, y_lim_max=y_axis_max,
-            optimize_lims=True
-        )
+        for n, (label_postfix, offsets) in enumerate(normalizations):
+            for k, name in enumerate(comparison_keypoints):
+                # without a ground truth, or a mean, in either scenario there is nothing to normalize by
+                if np.isnan(offsets[ pairs_idx[i] ][:, comparison_keypoints_idx[k]]).any():
+                    continue
+                label = keypoint_labels_dict.get(name, name)
+
+                # do the boxplotting, of X_c, X_o, Y_c, Y_o, Z_c, Z_o
+                plots.add(boxplot,
+                    data=comparisons[i][n][k],
+                    directory=plots_folder_path,
+                    data_label=label + " coordinates at Clear vs Overlapping conditions" + label_postfix,
+                    title=complementary_scenarios_c_o_pairs[i][0] + " vs " + complementary_scenarios_c_o_pairs[i][1] + " " + label.lower() + " coordinates" + label_postfix,
+                    x_tick_labels=[ "X_c", "X_o", "Y_c", "Y_o", "Z_c", "Z_o" ],
+                    optimize_lims=True
+                )
 
 
     # write statistical analysis report
-    for i in range(scenarios):
+    for i in (range(scenarios) if export_csvs else []):
         for j in range(part):
             # write in the appropriate CSV
             with open(csvs_folder_path + scenarios_dict.get(i) + "/" + body_25_body_parts_dict.get(j) + ".csv", 'a') as fp:
-                print >> fp , "elem," + (",".join( "t"+str(e) for e in range(max_logs) )) + ",nobs,min,max,mean,variance,skewness,kurtosis,std_dev"
+                print >> fp , "elem," + (",".join( "t"+str(e) for e in range(logs) )) + "," + (",".join(statistics_names))
                 for k in range(elem):
-                    print >> fp , element_dict.get(k) + "," + (",".join( str(e) for e in report_matrix[i][j][k] ))
+                    print >> fp , element_dict.get(k) + "," + (",".join( str(e) for e in report_matrix[i][j][k] )) + "," + (",".join( str(statistics[name][i][j][k]) for name in statistics_names ))
 
     # report occurences accross frames
     with open(statistics_folder_path + "evaluation_statistics.csv", 'w') as fp:
-        print >> fp , "Occurences accross " + str(max_logs) + " log frames"
+        print >> fp , "Occurences accross " + str(logs) + " log frames"
         print >> fp, "Keypoint" + "," + (",".join( str(e) for e in scenarios_dict.values() ))
         for i in range(part):
             # write in order of appearance Upper to Lower
@@ -598,8 +424,31 @@ if __name__ == "__main__":
     with open(statistics_folder_path + "right_wrist_statistics.csv", 'w') as fp:
         print >> fp, "Scenario,x_gt,y_gt,z_gt,x_mean,y_mean,z_mean,x_std_dev,y_std_dev,z_std_dev,x_gt_dev,y_gt_dev,z_gt_dev"
         for i in range(scenarios):
-            if np.nan not in right_wrist_stats[i]:
+            if not np.isnan(right_wrist_stats[i]).any():
                 print >> fp , scenarios_dict.get(i) + "," + (",".join( str(e) for e in right_wrist_stats[i] ))
 
+    # report every keypoint's errors from its ground truth accross frames, where it has both
+    with open(statistics_folder_path + "ground_truth_statistics.csv", 'w') as fp:
+        print >> fp, "Scenario,Keypoint,x_gt,y_gt,z_gt,x_mean,y_mean,z_mean,x_std_dev,y_std_dev,z_std_dev,x_gt_dev,y_gt_dev,z_gt_dev,frames,error_mean,error_median," + (",".join( "error_p" + str(p) for p in error_percentiles )) + "," + (",".join( "pck_" + str(r) for r in pck_radii ))
+        for i in range(scenarios):
+            for j in range(part):
+                if error_nobs[i][j]:
+                    print >> fp , scenarios_dict.get(i) + "," + body_25_body_parts_dict.get(j) + "," + (",".join( str(e) for e in ground_truth_stats[i][j] )) + "," + str(error_nobs[i][j]) + "," + (",".join( str(e) for e in error_stats[i][j] ))
+
+    # optionally, write the frames, statistics and z-table of every scenario to a single archive, labelled along each axis
+    if archive_output:
+        run_archive.writeArchive(archive_path,
+            dict(frames=report_matrix, statistics=statistics, z_table=stats_engine.zTable(report_matrix, statistics, axis=frame_axis),
+                 occurences=occurences_accross_frames_accross_scenarios.T, ground_truth=ground_truth, ground_truth_errors=ground_truth_errors),
+            axes=dict(frames=[ "scenario", "keypoint", "element", "frame" ], statistics=[ "scenario", "keypoint", "element" ],
+                      z_table=[ "scenario", "keypoint", "element", "frame" ], occurences=[ "scenario", "keypoint" ],
+                      ground_truth=[ "scenario", "keypoint", "coordinate" ], ground_truth_errors=[ "scenario", "keypoint", "frame" ]),
+            labels=dict(scenario=[ scenarios_dict.get(i) for i in range(scenarios) ], keypoint=[ body_25_body_parts_dict.get(j) for j in range(part) ],
+                        element=[ element_dict.get(k) for k in range(elem) ], coordinate=[ "x", "y", "z" ], frame=range(logs))
+        )
+
+
+    # render the plots, in a pool of worker processes if more than one worker is requested
+    plots.render()
 
     print "SUCCESS!"
\ No newline at end of file
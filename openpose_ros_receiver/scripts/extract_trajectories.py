@@ -2,20 +2,23 @@
 
 # python modules
 import os
+import multiprocessing
 import numpy as np
-import json
-import pandas as pd
-import matplotlib.pyplot as plt
-from pandas.tools.plotting import autocorrelation_plot
 from pandas import Series
 from pandas import DataFrame
-from pandas import TimeGrouper
+from pandas import Timestamp
+from pandas import to_timedelta
 
+# local modules
+import keypoint_models
+import person_tracker
+import json_reader
+import log_cache
+import plot_renderer
+import stats_engine
 
-# source: https://stackoverflow.com/questions/5389507/iterating-over-every-two-elements-in-a-list
-def grouped(iterable, n):
-    "s -> (s0,s1,s2,...sn-1), (sn,sn+1,sn+2,...s2n-1), (s2n,s2n+1,s2n+2,...s3n-1), ..."
-    return zip(*[iter(iterable)]*n)
+# plotting modules, imported by the first plot that is drawn
+plt = plot_renderer.LazyModule("matplotlib.pyplot")
 
 
 # Get a list of keys from dictionary which has the given value
@@ -41,9 +44,9 @@ def lineplot(data, path, x_label=None, y_label=None, title=None):
     plt.close()
 
 
-# Define a function for a histogram
-def histogram(data, path, x_label=None, y_label=None, title=None):
-    data.hist()
+# Define a function for a histogram of precomputed counts
+def histogram(edges, counts, path, x_label=None, y_label=None, title=None):
+    plt.hist(edges[:-1], bins=edges, weights=counts)
     if x_label:
         plt.xlabel(x_label, fontsize=8)
     if y_label:
@@ -54,9 +57,9 @@ def histogram(data, path, x_label=None, y_label=None, title=None):
     plt.close()
 
 
-# Define a function for a density plot
-def density_plot(data, path, x_label=None, y_label=None, title=None):
-    data.plot(kind='kde')
+# Define a function for a plot of a precomputed density
+def density_plot(grid, density, path, x_label=None, y_label=None, title=None):
+    plt.plot(grid, density)
     if x_label:
         plt.xlabel(x_label, fontsize=8)
     if y_label:
@@ -125,28 +128,39 @@ def boxplot(data, path, x_label=None, y_label=None, title=None):
     plt.close()
 
 
+# Define a function for autocorrelation and power spectrum plots of a few series
+def spectrum_plot(lags, autocorrelation, frequencies, power, path, data_names=None, title=None):
+    fig, (acf_ax, psd_ax) = plt.subplots(nrows=2)
+    for k in range(len(autocorrelation)):
+        label = data_names[k] if data_names else None
+        acf_ax.plot(lags, autocorrelation[k], label=label)
+        psd_ax.semilogy(frequencies[1:], power[k][1:], label=label)
+    # the 95% and 99% confidence bands of a white noise autocorrelation, as pandas draws them
+    for z, linestyle in [ (1.959963984540054, '-'), (2.5758293035489004, '--') ]:
+        acf_ax.axhline(y=z / np.sqrt(len(lags)), linestyle=linestyle, color='grey')
+        acf_ax.axhline(y=-z / np.sqrt(len(lags)), linestyle=linestyle, color='grey')
+    acf_ax.axhline(y=0.0, color='black')
+    acf_ax.set_xlabel("Lag (s)", fontsize=8)
+    acf_ax.set_ylabel("Autocorrelation", fontsize=8)
+    psd_ax.set_xlabel("Frequency (Hz)", fontsize=8)
+    psd_ax.set_ylabel("Power spectral density", fontsize=8)
+    if data_names:
+        acf_ax.legend(prop={'size': 8})
+    if title:
+        acf_ax.set_title(title, fontsize=10)
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
 # MAIN FUNCTION
 
 
 if __name__ == "__main__":
     # Body 25 human pose model specific variables
-    body_25_body_parts_dict = dict([ (0,  "Nose"), (1,  "Neck"), (2,  "RShoulder"), (3,  "RElbow"), (4,  "RWrist"),
-                                     (5,  "LShoulder"), (6,  "LElbow"), (7,  "LWrist"), (8,  "MidHip"), (9,  "RHip"),
-                                     (10, "RKnee"), (11, "RAnkle"), (12, "LHip"), (13, "LKnee"), (14, "LAnkle"),
-                                     (15, "REye"), (16, "LEye"), (17, "REar"), (18, "LEar"), (19, "LBigToe"),
-                                     (20, "LSmallToe"), (21, "LHeel"), (22, "RBigToe"), (23, "RSmallToe"), (24, "RHeel"),
-                                     (25, "Background")
-                                    ])
-    body_25_body_part_pairs = [ [1, 8], [1, 2], [1, 5], [2, 3], [3, 4], [5, 6], [6, 7],
-                                [8, 9], [9, 10], [10, 11], [8, 12], [12, 13], [13, 14], [1, 0],
-                                [0, 15], [15, 17], [0, 16], [16, 18], [14, 19],
-                                [19, 20], [14, 21], [11, 22], [22, 23], [11, 24]
-                            ]
-    body_25_body_part_pairs_dict = dict([   (1, [0, 2, 5, 8]), (2, [3]), (3, [4]), (5, [6]), (6, [7]),
-                                            (8, [9, 12]), (9, [10]), (10, [11]), (12, [13]), (13, [14]),
-                                            (0, [15, 16]), (15, [17]), (16, [18]), (14, [19, 21]),
-                                            (19, [20]), (11, [22, 24]), (22, [23])
-                                        ])
+    body_25_model = keypoint_models.BODY_25
+    body_25_body_parts_dict = body_25_model.parts_dict
+    body_25_body_part_pairs_dict = body_25_model.pairs_dict
 
     # OpenPose specific variables
     element_dict = dict([ (0, "x"), (1, "y")])
@@ -173,139 +187,139 @@ if __name__ == "__main__":
     trajectories_plots_boxplots_path = trajectories_plots_path + trajectories_plots_boxplots_dir
     trajectories_plots_autocorrelation_dir = "autocorrelation/"
     trajectories_plots_autocorrelation_path = trajectories_plots_path + trajectories_plots_autocorrelation_dir
+    trajectories_spectra_file = "spectra.npz"
+    trajectories_spectra_path = trajectories_path + trajectories_spectra_file
+    trajectories_densities_file = "densities.npz"
+    trajectories_densities_path = trajectories_path + trajectories_densities_file
 
     # Task specific variables
     trajectories_idx = 0
     # we expect [..., x_i, y_i, prob_i, ...] grouping for our 2d human body pose list
     grouping_factor = 3
-    # create our 3d report matrix, e.g. for 10 log frames: [BodyPart][t0,...,t9][x/y] --> 25 * 10 * 2
+    # create our 3d trajectories tensor, e.g. for 10 log frames: [t0,...,t9][BodyPart][x/y] --> 10 * 25 * 2
     max_logs = 60
     part, val, elem = 25, max_logs, 2
-    report_matrix = [ [ [ np.nan for k in range(elem) ] for j in range(val) ] for i in range(part) ]
+    trajectories = np.full((val, part, elem), np.nan)
+    x_idx, y_idx = getKeysByValue(element_dict, "x")[0], getKeysByValue(element_dict, "y")[0]
+    # set to False to skip exporting the trajectories to CSVs, once every plot is done
+    export_csvs = True
+    # set to True to track every person of each frame and follow the longest track, instead of the first person listed
+    multi_person = False
+    track_max_distance = 100.0  # mean keypoint distance, in pixels, up to which a person may continue a track
+    track_max_gap = 10          # frames a track may go unseen before it is dropped
+    read_workers = 8            # threads reading the JSON frame files
+    frame_rate = 30.0           # frames per second OpenPose processed, which time the frames by their numbers
+    capture_start = None        # time of frame 0, e.g. "2019-01-31 15:30:00", or the epoch if unknown
+    resample_rule = None        # set to e.g. "50ms" to resample the trajectories to a uniform 20 Hz
+    resample_how = "mean"       # how the frames of each resampling bin are aggregated, e.g. "median", "first" or "last"
+    histogram_bins = 50         # bins of the histograms, shared by all keypoints of a coordinate so that they compare
+    spectra_plots = True        # set to False to only save the autocorrelation and power spectra arrays, without plotting them
+    plot_workers = multiprocessing.cpu_count()   # set to 1 to render the plots serially
+    stats_only = False                           # set to True to only write the trajectory CSVs and the spectra and densities arrays, without ever importing the plotting stack
+    plots = plot_renderer.PlotRenderer(workers=plot_workers, enabled=not stats_only)
 
     # create trajectories directory
     if not os.path.exists(trajectories_path):
         os.makedirs(trajectories_path)
 
-    # create trajectories csvs directory
-    if not os.path.exists(trajectories_csvs_path):
-        os.makedirs(trajectories_csvs_path)
-
     # create trajectories plots directory
-    if not os.path.exists(trajectories_plots_path):
+    if not stats_only and not os.path.exists(trajectories_plots_path):
         os.makedirs(trajectories_plots_path)
 
     # create trajectories plots trajectories directory
-    if not os.path.exists(trajectories_plots_trajectories_path):
+    if not stats_only and not os.path.exists(trajectories_plots_trajectories_path):
         os.makedirs(trajectories_plots_trajectories_path)
 
     # create trajectories plots lines directory
-    if not os.path.exists(trajectories_plots_lines_path):
+    if not stats_only and not os.path.exists(trajectories_plots_lines_path):
         os.makedirs(trajectories_plots_lines_path)
 
     # create trajectories plots histograms directory
-    if not os.path.exists(trajectories_plots_histograms_path):
+    if not stats_only and not os.path.exists(trajectories_plots_histograms_path):
         os.makedirs(trajectories_plots_histograms_path)
 
     # create trajectories plots boxplots directory
-    if not os.path.exists(trajectories_plots_boxplots_path):
+    if not stats_only and not os.path.exists(trajectories_plots_boxplots_path):
         os.makedirs(trajectories_plots_boxplots_path)
 
     # create trajectories plots autocorrelation directory
-    if not os.path.exists(trajectories_plots_autocorrelation_path):
+    if not stats_only and not os.path.exists(trajectories_plots_autocorrelation_path):
         os.makedirs(trajectories_plots_autocorrelation_path)
 
-    # create CSVs
-    fp = open(trajectories_csvs_path + "all_keypoints_timeseries" + ".csv", 'w')
-    fp.close()
-    for _, value in body_25_body_parts_dict.items():
-        fp = open(trajectories_csvs_path + value + "_x" + ".csv", 'w')
-        fp.close()
-        fp = open(trajectories_csvs_path + value + "_y" + ".csv", 'w')
-        fp.close()
-
-
-    # access the files of the folders of the logs directory
-    log = 0
-    for file in os.listdir(json_path):
-        try:
-            if os.path.isfile( os.path.join(json_path, file) ):
-                # read from file
-                with open( os.path.join(json_path, file), 'r' ) as fp:
-                    # print "log: ", log
-                    for _, line in enumerate(fp):
-                        parsed_json = json.loads(line)
-                        # print parsed_json[trajectories_source]
-                        if parsed_json[trajectories_source]:
-                            log_list = parsed_json[trajectories_source][trajectories_idx][trajectories_entry]
-
-                            # for debugging
-                            assert( not len(log_list) % 3)
-
-                            log_list_grouped = grouped(log_list, grouping_factor)
-                            keypoint_idx = 0
-                            for x, y, prob in log_list_grouped:
-                                x, y, prob = np.float64(x), np.float64(y), np.float64(prob)
-                                # print body_25_body_parts_dict.get(keypoint_idx), x, y, prob
-                                # first sanitize
-                                if np.isnan(x): x = 0.0
-                                if np.isnan(y): y = 0.0
-                                if np.isnan(prob): prob = 0.0
-                                report_matrix[keypoint_idx][log][ getKeysByValue(element_dict, "x")[0] ] = x
-                                report_matrix[keypoint_idx][log][ getKeysByValue(element_dict, "y")[0] ] = y
-
-                                keypoint_idx += 1
-
-                log += 1
-
-                if log == max_logs:
-                    break
-
-        except Exception as e:
-            raise e
-
-    # print report_matrix
-
-
-    # write statistical analysis report
-    for i in range(part):
-        # write in the appropriate CSVs
-        # x values
-        with open(trajectories_csvs_path + body_25_body_parts_dict.get(i) + "_x" + ".csv", 'a') as fp:
-            print >> fp , "t,x"
-            for j in range(val):
-                print >> fp , "t" + str(j) + "," + str(report_matrix[i][j][ getKeysByValue(element_dict, "x")[0] ])
-        # y values
-        with open(trajectories_csvs_path + body_25_body_parts_dict.get(i) + "_y" + ".csv", 'a') as fp:
-            print >> fp , "t,y"
-            for j in range(val):
-                print >> fp , "t" + str(j) + "," + str(report_matrix[i][j][ getKeysByValue(element_dict, "y")[0] ])
-
-
-    # all keypoints timeseries
-    with open(trajectories_csvs_path + "all_keypoints_timeseries" + ".csv", 'a') as fp:
-        for i in range(part):
-            print >> fp, body_25_body_parts_dict.get(i)
-            print >> fp, "x:" + ",".join( [ str(report_matrix[i][j][ getKeysByValue(element_dict, "x")[0] ]) for j in range(val) ] )
-            print >> fp, "y:" + ",".join( [ str(report_matrix[i][j][ getKeysByValue(element_dict, "y")[0] ]) for j in range(val) ] )
 
+    # read the first max_logs JSON frames in frame order, every person of each as a [person][keypoint][x/y/prob] array
+    frame_files = json_reader.listFrameFiles(json_path)[0:max_logs]
+    frame_people = json_reader.readPoseFrames(frame_files, trajectories_source, trajectories_entry, grouping_factor, workers=read_workers)
+
+    # time the frames by their numbers, or positions if they are not numbered, and the frames past the last one read as if they followed it
+    frame_numbers = [ json_reader.frameNumber(path) for path in frame_files ]
+    if None in frame_numbers:
+        frame_numbers = list(range(len(frame_files)))
+    frame_numbers += [ (frame_numbers[-1] if frame_numbers else -1) + k for k in range(1, val - len(frame_numbers) + 1) ]
+    frame_times = Timestamp(capture_start or 0) + to_timedelta(np.array(frame_numbers, dtype=np.float64) / frame_rate, unit='s')
+
+    # follow the person listed at trajectories_idx
+    if not multi_person:
+        for log, people in enumerate(frame_people):
+            if len(people):
+                # first sanitize
+                pose = np.where(np.isnan(people[trajectories_idx]), 0.0, people[trajectories_idx])
+                trajectories[log, 0:len(pose), x_idx] = pose[:, 0]
+                trajectories[log, 0:len(pose), y_idx] = pose[:, 1]
+
+    # or link the people of consecutive frames into tracks, save them all and follow the one seen in most frames
+    else:
+        track_ids = person_tracker.trackPeople(frame_people, max_distance=track_max_distance, max_gap=track_max_gap)
+        track_first_frames, tracks = person_tracker.buildTracks(frame_people, track_ids)
+        np.savez(trajectories_path + "tracks" + ".npz", first_frames=track_first_frames, **dict( ("track" + str(k), track) for k, track in enumerate(tracks) ))
+
+        if tracks:
+            k = np.argmax([ (~np.isnan(track[:, :, 0])).any(axis=1).sum() for track in tracks ])
+            seen = (~np.isnan(tracks[k][:, :, 0])).any(axis=1)
+            # first sanitize, like the single person keypoints
+            trajectories[ track_first_frames[k]:track_first_frames[k] + len(tracks[k]) ] = np.where(seen[:, np.newaxis, np.newaxis], np.nan_to_num(tracks[k][:, :, [x_idx, y_idx]]), np.nan)
+
+    # print trajectories
+
+    # hold each coordinate's trajectories in memory, as a [frame time][keypoint] DataFrame
+    trajectories_x = DataFrame(trajectories[:, :, x_idx], index=frame_times, columns=range(part))
+    trajectories_y = DataFrame(trajectories[:, :, y_idx], index=frame_times, columns=range(part))
+
+    # resample them to a uniform rate, every keypoint at once, if asked to
+    if resample_rule:
+        trajectories_x = trajectories_x.resample(resample_rule).agg(resample_how)
+        trajectories_y = trajectories_y.resample(resample_rule).agg(resample_how)
+
+    # autocorrelation and power spectra of every keypoint coordinate at once, by batched FFTs along the [coordinate][keypoint][frame] tensor's frame axis
+    coordinates = np.stack([ trajectories_x.values.T, trajectories_y.values.T ])
+    frame_step = to_timedelta(resample_rule).total_seconds() if resample_rule else 1.0 / frame_rate
+    lags = np.arange(len(trajectories_x)) * frame_step
+    autocorrelation = stats_engine.autocorrelationTensor(coordinates)
+    frequencies, power = stats_engine.powerSpectrumTensor(coordinates, 1.0 / frame_step)
+    dominant_frequency = stats_engine.dominantFrequency(frequencies, power)
+
+    # save them to a single array file, atomically
+    log_cache.saveArrays(trajectories_spectra_path, keypoints=np.array([ body_25_body_parts_dict.get(i) for i in range(part) ]), coordinates=np.array([ element_dict.get(e) for e in range(len(element_dict)) ]),
+                         lags=lags, autocorrelation=autocorrelation, frequencies=frequencies, power=power, dominant_frequency=dominant_frequency)
 
-    # set timeseries data specifications
-    header_x, header_y = ['t', 'x'], ['t', 'y']
-    dtypes_x, dtypes_y = {'t':'str', 'x':'float64'}, {'t':'str', 'y':'float64'}
+    # histograms and kernel density estimates of every keypoint coordinate at once, the histograms on bins shared by each coordinate's keypoints
+    histogram_counts, histogram_edges = [ np.array(a) for a in zip(*[ stats_engine.histogramTensor(c, histogram_bins) for c in coordinates ]) ]
+    density_grid, density, density_bandwidth = stats_engine.densityTensor(coordinates)
+
+    # save them to a single array file too, atomically
+    log_cache.saveArrays(trajectories_densities_path, keypoints=np.array([ body_25_body_parts_dict.get(i) for i in range(part) ]), coordinates=np.array([ element_dict.get(e) for e in range(len(element_dict)) ]),
+                         histogram_edges=histogram_edges, histogram_counts=histogram_counts, density_grid=density_grid, density=density, density_bandwidth=density_bandwidth)
 
 
     # create timeseries figures
-    all_series_x, all_series_y = DataFrame(), DataFrame()
     for i in range(part):
-        series_x = pd.read_csv(trajectories_csvs_path + body_25_body_parts_dict.get(i) + "_x" + ".csv", names=header_x, dtype=dtypes_x, header=0)
-        series_y = pd.read_csv(trajectories_csvs_path + body_25_body_parts_dict.get(i) + "_y" + ".csv", names=header_y, dtype=dtypes_y, header=0)
+        series_x, series_y = DataFrame({ 'x': trajectories_x[i] }), DataFrame({ 'y': trajectories_y[i] })
 
-        x_list, y_list = series_x['x'].values.tolist(), series_y['y'].values.tolist()
+        x_list, y_list = trajectories_x[i].values, trajectories_y[i].values
         # print x_list, y_list
 
         # timeseries plot trajectory
-        plot(
+        plots.add(plot,
             x_data=x_list,
             y_data=y_list,
             x_label="X Coord.",
@@ -315,69 +329,68 @@ if __name__ == "__main__":
         )
 
         # timeseries line plots
-        lineplot(
+        plots.add(lineplot,
             data=series_x,
-            x_label="Instance",
+            x_label="Time",
             y_label="X coord.",
             title=body_25_body_parts_dict.get(i) + " x coordinate line plot",
             path=trajectories_plots_lines_path + body_25_body_parts_dict.get(i) + "_x" + "_line" + ".png"
         )
-        lineplot(
+        plots.add(lineplot,
             data=series_y,
-            x_label="Instance",
+            x_label="Time",
             y_label="Y coord.",
             title=body_25_body_parts_dict.get(i) + " y coordinate line plot",
             path=trajectories_plots_lines_path + body_25_body_parts_dict.get(i) + "_y" + "_line" + ".png"
         )
 
+        # timeseries autocorrelation and power spectrum plots
+        if spectra_plots:
+            plots.add(spectrum_plot,
+                lags=lags,
+                autocorrelation=autocorrelation[:, i],
+                frequencies=frequencies,
+                power=power[:, i],
+                data_names=[ "x coord.", "y coord." ],
+                title=body_25_body_parts_dict.get(i) + " autocorrelation and power spectrum",
+                path=trajectories_plots_autocorrelation_path + body_25_body_parts_dict.get(i) + "_spectrum" + ".png"
+            )
+
         # timeseries histogram and density plots
         # histograms
-        histogram(
-            data=series_x,
+        plots.add(histogram,
+            edges=histogram_edges[x_idx],
+            counts=histogram_counts[x_idx, i],
             x_label="X coord.",
             y_label="Num. of occurences",
             title=body_25_body_parts_dict.get(i) + " x coordinate histogram",
             path=trajectories_plots_histograms_path + body_25_body_parts_dict.get(i) + "_x" + "_hist" + ".png"
         )
-        histogram(
-            data=series_y,
+        plots.add(histogram,
+            edges=histogram_edges[y_idx],
+            counts=histogram_counts[y_idx, i],
             x_label="Y coord.",
             y_label="Num. of occurences",
             title=body_25_body_parts_dict.get(i) + " y coordinate histogram",
             path=trajectories_plots_histograms_path + body_25_body_parts_dict.get(i) + "_y" + "_hist" + ".png"
         )
         # densities
-        try:
-            density_plot(
-                data=series_x,
-                x_label="X coord.",
-                y_label="Density of values",
-                title=body_25_body_parts_dict.get(i) + " x coordinate density plot",
-                path=trajectories_plots_histograms_path + body_25_body_parts_dict.get(i) + "_x_dens" + ".png"
-            )
-            density_plot(
-                data=series_y,
-                x_label="Y coord.",
-                y_label="Density of values",
-                title=body_25_body_parts_dict.get(i) + " y coordinate density plot",
-                path=trajectories_plots_histograms_path + body_25_body_parts_dict.get(i) + "_y_dens" + ".png"
-            )
-        except Exception as e:
-            if e.__class__.__name__ == "LinAlgError":
-                # source: https://stats.stackexchange.com/questions/89754/statsmodels-error-in-kde-on-a-list-of-repeated-values
-                '''
-                set_bandwidth() for kde is most probably not working, because of too many repeated instances of the same number.
-                In such a case, we are feeding the code a distribution whose standard deviation is zero,
-                and the code is attempting to use this value to calculate an initial guess for the KDE bandwidth parameter,
-                and it's choking because zero isn't really a valid value.
-                So, we do not plot and we just continue.
-                '''
-                continue
-            raise e
-        
-        # for timeseries boxplots
-        all_series_x[ i ] = [ e[1] for e in series_x.values.tolist() ]
-        all_series_y[ i ] = [ e[1] for e in series_y.values.tolist() ]
+        plots.add(density_plot,
+            grid=density_grid[x_idx, i],
+            density=density[x_idx, i],
+            x_label="X coord.",
+            y_label="Density of values",
+            title=body_25_body_parts_dict.get(i) + " x coordinate density plot",
+            path=trajectories_plots_histograms_path + body_25_body_parts_dict.get(i) + "_x_dens" + ".png"
+        )
+        plots.add(density_plot,
+            grid=density_grid[y_idx, i],
+            density=density[y_idx, i],
+            x_label="Y coord.",
+            y_label="Density of values",
+            title=body_25_body_parts_dict.get(i) + " y coordinate density plot",
+            path=trajectories_plots_histograms_path + body_25_body_parts_dict.get(i) + "_y_dens" + ".png"
+        )
 
         # # debugging
         # print(series_x.head())
@@ -386,14 +399,9 @@ if __name__ == "__main__":
 
     # timeseries plot trajectories among pairs
     for i in range(part):
-        series_x = pd.read_csv(trajectories_csvs_path + body_25_body_parts_dict.get(i) + "_x" + ".csv", names=header_x, dtype=dtypes_x, header=0)
-        series_y = pd.read_csv(trajectories_csvs_path + body_25_body_parts_dict.get(i) + "_y" + ".csv", names=header_y, dtype=dtypes_y, header=0)
-
-        x_list, y_list = series_x['x'].values.tolist(), series_y['y'].values.tolist()
-
         x_values, y_values = [], []
-        x_values.append(x_list)
-        y_values.append(y_list)
+        x_values.append(trajectories_x[i].values)
+        y_values.append(trajectories_y[i].values)
 
         # if keypoint with ID i has pairs
         if i in body_25_body_part_pairs_dict.keys():
@@ -405,37 +413,34 @@ if __name__ == "__main__":
 
             # for every paired keypoint with ID j
             for j in paired_keypoints:
-                series_x = pd.read_csv(trajectories_csvs_path + body_25_body_parts_dict.get(j) + "_x" + ".csv", names=header_x, dtype=dtypes_x, header=0)
-                series_y = pd.read_csv(trajectories_csvs_path + body_25_body_parts_dict.get(j) + "_y" + ".csv", names=header_y, dtype=dtypes_y, header=0)
-
-                x_list, y_list = series_x['x'].values.tolist(), series_y['y'].values.tolist()
-                x_values.append(x_list)
-                y_values.append(y_list)
+                x_values.append(trajectories_x[j].values)
+                y_values.append(trajectories_y[j].values)
                 
                 keypoint_names.append(body_25_body_parts_dict.get(j))
-            
-                multiplot(
-                    x_data=x_values,
-                    y_data=y_values,
-                    data_names=keypoint_names,
-                    x_label="X Coord.",
-                    y_label="Y Coord.",
-                    title=body_25_body_parts_dict.get(j) + " paired with: " + ", ".join([ body_25_body_parts_dict.get(kp) for kp in paired_keypoints ]) + " trajectory plots",
-                    path=trajectories_plots_trajectories_path + body_25_body_parts_dict.get(i) + "_&_" + "_".join([ body_25_body_parts_dict.get(kp) for kp in paired_keypoints ]) +"_trajectories" + ".png"
-                )
+
+            # plot them all together, once they are gathered
+            plots.add(multiplot,
+                x_data=x_values,
+                y_data=y_values,
+                data_names=keypoint_names,
+                x_label="X Coord.",
+                y_label="Y Coord.",
+                title=body_25_body_parts_dict.get(j) + " paired with: " + ", ".join([ body_25_body_parts_dict.get(kp) for kp in paired_keypoints ]) + " trajectory plots",
+                path=trajectories_plots_trajectories_path + body_25_body_parts_dict.get(i) + "_&_" + "_".join([ body_25_body_parts_dict.get(kp) for kp in paired_keypoints ]) +"_trajectories" + ".png"
+            )
 
 
     # timeseries boxplots
-    # print all_series_x, all_series_y
-    boxplot(
-        data=all_series_x,
+    # print trajectories_x, trajectories_y
+    plots.add(boxplot,
+        data=trajectories_x,
         x_label="Keypoint ID",
         y_label="X coord. value",
         title="All keypoints x coordinate boxplot",
         path=trajectories_plots_boxplots_path + "all_keypoints_x" + "_boxplot" + ".png"
     )
-    boxplot(
-        data=all_series_y,
+    plots.add(boxplot,
+        data=trajectories_y,
         x_label="Keypoint ID",
         y_label="Y coord. value",
         title="All keypoints y coordinate boxplot",
@@ -443,4 +448,33 @@ if __name__ == "__main__":
     )
 
 
+    # optionally, export the trajectories to CSVs
+    if export_csvs:
+        # create trajectories csvs directory
+        if not os.path.exists(trajectories_csvs_path):
+            os.makedirs(trajectories_csvs_path)
+
+        for i in range(part):
+            # x values
+            with open(trajectories_csvs_path + body_25_body_parts_dict.get(i) + "_x" + ".csv", 'w') as fp:
+                print >> fp , "time,x"
+                for time, value in zip(trajectories_x.index, trajectories_x[i].values):
+                    print >> fp , time.isoformat() + "," + str(value)
+            # y values
+            with open(trajectories_csvs_path + body_25_body_parts_dict.get(i) + "_y" + ".csv", 'w') as fp:
+                print >> fp , "time,y"
+                for time, value in zip(trajectories_y.index, trajectories_y[i].values):
+                    print >> fp , time.isoformat() + "," + str(value)
+
+        # all keypoints timeseries
+        with open(trajectories_csvs_path + "all_keypoints_timeseries" + ".csv", 'w') as fp:
+            for i in range(part):
+                print >> fp, body_25_body_parts_dict.get(i)
+                print >> fp, "x:" + ",".join( [ str(e) for e in trajectories_x[i].values ] )
+                print >> fp, "y:" + ",".join( [ str(e) for e in trajectories_y[i].values ] )
+
+
+    # render the plots, in a pool of worker processes if more than one worker is requested
+    plots.render()
+
     print "SUCCESS!"
\ No newline at end of file
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+
+# python modules
+import os
+import re
+import numpy as np
+from multiprocessing.pool import ThreadPool
+
+# use a faster JSON backend if one is installed
+try:
+    import orjson as json_backend
+except ImportError:
+    try:
+        import ujson as json_backend
+    except ImportError:
+        import json as json_backend
+
+
+# Sort key that orders frame file names by their numbers, e.g. "..._9_keypoints.json" before "..._10_keypoints.json"
+def frameSortKey(name):
+    return [ int(token) if token.isdigit() else token for token in re.split(r'(\d+)', name) ]
+
+
+# List the frame files of an OpenPose JSON output directory, in frame order
+def listFrameFiles(json_path):
+    names = [ name for name in os.listdir(json_path) if os.path.isfile(os.path.join(json_path, name)) ]
+    return [ os.path.join(json_path, name) for name in sorted(names, key=frameSortKey) ]
+
+
+# Frame number of a frame file, the last number in its name, e.g. 12 for "..._000000000012_keypoints.json", or None if it has none
+def frameNumber(path):
+    numbers = [ token for token in frameSortKey(os.path.basename(path)) if not isinstance(token, str) ]
+    return numbers[-1] if numbers else None
+
+
+# Read a file's raw contents
+def readFile(path):
+    with open(path, 'rb') as fp:
+        return fp.read()
+
+
+# Decode an OpenPose JSON frame into a [person][keypoint][x/y/prob] array
+def decodePoseFrame(contents, source="people", entry="pose_keypoints_2d", grouping_factor=3):
+    people = json_backend.loads(contents)[source] if contents.strip() else []
+    poses = [ np.asarray(person[entry], dtype=np.float64).reshape(-1, grouping_factor) for person in people ]
+    if not poses:
+        return np.zeros((0, 0, grouping_factor))
+    return np.stack(poses)
+
+
+# Read OpenPose JSON frames in the given order, with a pool of threads for the file I/O, into [person][keypoint][x/y/prob] arrays
+def readPoseFrames(paths, source="people", entry="pose_keypoints_2d", grouping_factor=3, workers=8):
+    pool = ThreadPool(processes=max(1, workers))
+    try:
+        return [ decodePoseFrame(contents, source, entry, grouping_factor) for contents in pool.imap(readFile, paths, chunksize=64) ]
+    finally:
+        pool.close()
+        pool.join()
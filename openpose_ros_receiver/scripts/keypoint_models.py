@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+# python modules
+import numpy as np
+
+
+# Human pose keypoint model: part names, name <-> index maps, edges, orders of appearance and subset masks, built once
+class KeypointModel(object):
+
+    def __init__(self, name, part_names, pairs, background=False, orders=None, subsets=None):
+        self.name = name
+        self.part_names = list(part_names)
+        self.part = len(self.part_names)
+
+        # index -> name, and name -> index, including the background pseudo-part of the OpenPose heatmaps
+        self.parts_dict = dict(enumerate(self.part_names + ([ "Background" ] if background else [])))
+        self.index = dict( (value, key) for key, value in self.parts_dict.items() )
+
+        # edges as a [pair][2] index array, and each edge source with its (sorted) edge targets
+        self.pairs = np.array(pairs, dtype=np.intp).reshape(-1, 2)
+        self.pairs_dict = {}
+        for source, target in self.pairs.tolist():
+            self.pairs_dict.setdefault(source, []).append(target)
+        for source in self.pairs_dict:
+            self.pairs_dict[source].sort()
+
+        # orders of appearance as index arrays, and subsets as boolean masks over the parts
+        self.orders = dict( (key, np.array(value, dtype=np.intp)) for key, value in (orders or {}).items() )
+        self.subsets = {}
+        for key, value in (subsets or {}).items():
+            self.subsets[key] = np.zeros(self.part, dtype=bool)
+            self.subsets[key][ self.indices(value) ] = True
+
+    # Return the index array of a list of part names
+    def indices(self, names):
+        return np.array([ self.index[name] for name in names ], dtype=np.intp)
+
+
+# Chain the keypoints [start, stop) with edges, closing the loop if asked to
+def chainPairs(start, stop, closed=False):
+    pairs = [ [i, i+1] for i in range(start, stop-1) ]
+    if closed:
+        pairs.append([stop-1, start])
+    return pairs
+
+
+# OpenPose BODY_25 human pose model
+BODY_25 = KeypointModel(
+    "BODY_25",
+    part_names=[ "Nose", "Neck", "RShoulder", "RElbow", "RWrist",
+                 "LShoulder", "LElbow", "LWrist", "MidHip", "RHip",
+                 "RKnee", "RAnkle", "LHip", "LKnee", "LAnkle",
+                 "REye", "LEye", "REar", "LEar", "LBigToe",
+                 "LSmallToe", "LHeel", "RBigToe", "RSmallToe", "RHeel" ],
+    pairs=[ [1, 8], [1, 2], [1, 5], [2, 3], [3, 4], [5, 6], [6, 7],
+            [8, 9], [9, 10], [10, 11], [8, 12], [12, 13], [13, 14], [1, 0],
+            [0, 15], [15, 17], [0, 16], [16, 18], [14, 19],
+            [19, 20], [14, 21], [11, 22], [22, 23], [11, 24] ],
+    background=True,
+    orders=dict([ ("LR", [ 4, 23, 3, 22, 11, 2, 10, 9, 24, 17, 15, 8, 1, 0, 16, 18, 21, 12, 13, 14, 19, 5, 6, 20, 7 ]),
+                  ("upper_body_LR", [ 4, 3, 2, 9, 17, 15, 8, 1, 0, 16, 18, 12, 5, 6, 7 ]),
+                  ("UL", [ 15, 16, 17, 18, 0, 2, 5, 1, 3, 6, 4, 7, 9, 12, 8, 10, 13, 11, 14, 24, 21, 23, 20, 22, 19 ]),
+                  ("upper_body_UL", [ 15, 16, 17, 18, 0, 2, 5, 1, 3, 6, 4, 7, 9, 12, 8 ])
+                ]),
+    subsets=dict([ ("upper_body", [ "Nose", "Neck", "RShoulder", "RElbow", "RWrist", "LShoulder", "LElbow", "LWrist",
+                                    "MidHip", "RHip", "LHip", "REye", "LEye", "REar", "LEar" ])
+                 ])
+)
+
+# OpenPose COCO human pose model
+COCO = KeypointModel(
+    "COCO",
+    part_names=[ "Nose", "Neck", "RShoulder", "RElbow", "RWrist",
+                 "LShoulder", "LElbow", "LWrist", "RHip", "RKnee",
+                 "RAnkle", "LHip", "LKnee", "LAnkle", "REye",
+                 "LEye", "REar", "LEar" ],
+    pairs=[ [1, 2], [1, 5], [2, 3], [3, 4], [5, 6], [6, 7],
+            [1, 8], [8, 9], [9, 10], [1, 11], [11, 12], [12, 13],
+            [1, 0], [0, 14], [14, 16], [0, 15], [15, 17] ],
+    background=True,
+    subsets=dict([ ("upper_body", [ "Nose", "Neck", "RShoulder", "RElbow", "RWrist", "LShoulder", "LElbow", "LWrist",
+                                    "RHip", "LHip", "REye", "LEye", "REar", "LEar" ])
+                 ])
+)
+
+# OpenPose face model: jaw contour, eyebrows, nose, eyes, lips and pupils
+FACE_70 = KeypointModel(
+    "FACE_70",
+    part_names=[ "Jaw" + str(i) for i in range(17) ] +
+               [ "REyebrow" + str(i) for i in range(5) ] + [ "LEyebrow" + str(i) for i in range(5) ] +
+               [ "NoseBridge" + str(i) for i in range(4) ] + [ "Nostrils" + str(i) for i in range(5) ] +
+               [ "REye" + str(i) for i in range(6) ] + [ "LEye" + str(i) for i in range(6) ] +
+               [ "OuterLip" + str(i) for i in range(12) ] + [ "InnerLip" + str(i) for i in range(8) ] +
+               [ "RPupil", "LPupil" ],
+    pairs=chainPairs(0, 17) + chainPairs(17, 22) + chainPairs(22, 27) + chainPairs(27, 31) + chainPairs(31, 36) +
+          chainPairs(36, 42, closed=True) + chainPairs(42, 48, closed=True) + chainPairs(48, 60, closed=True) + chainPairs(60, 68, closed=True),
+    subsets=dict([ ("eyes", [ "REye" + str(i) for i in range(6) ] + [ "LEye" + str(i) for i in range(6) ] + [ "RPupil", "LPupil" ]),
+                   ("mouth", [ "OuterLip" + str(i) for i in range(12) ] + [ "InnerLip" + str(i) for i in range(8) ])
+                 ])
+)
+
+# OpenPose hand models: the wrist and four joints per finger, from the thumb to the pinky
+hand_21_part_names = [ "Wrist" ] + [ finger + str(i) for finger in [ "Thumb", "Index", "Middle", "Ring", "Pinky" ] for i in range(1, 5) ]
+hand_21_pairs = [ pair for finger in range(5) for pair in [ [0, 4*finger+1] ] + chainPairs(4*finger+1, 4*finger+5) ]
+hand_21_fingertips = [ finger + "4" for finger in [ "Thumb", "Index", "Middle", "Ring", "Pinky" ] ]
+RIGHT_HAND_21 = KeypointModel("RIGHT_HAND_21", part_names=[ "RHand" + name for name in hand_21_part_names ], pairs=hand_21_pairs,
+                              subsets=dict([ ("fingertips", [ "RHand" + name for name in hand_21_fingertips ]) ]))
+LEFT_HAND_21 = KeypointModel("LEFT_HAND_21", part_names=[ "LHand" + name for name in hand_21_part_names ], pairs=hand_21_pairs,
+                             subsets=dict([ ("fingertips", [ "LHand" + name for name in hand_21_fingertips ]) ]))
+
+
+# Every model by name
+models = dict([ (model.name, model) for model in [ BODY_25, FACE_70, RIGHT_HAND_21, LEFT_HAND_21, COCO ] ])
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+
+# python modules
+import os
+import numpy as np
+
+# local modules
+import log_parser
+
+
+# Read a cache file into a {file name: (size, mtime, frame, lines)} dictionary, or an empty one if it is missing, stale or unreadable
+def readCache(cache_path, part, elem):
+    entries = {}
+    if not os.path.isfile(cache_path):
+        return entries
+
+    try:
+        with np.load(cache_path) as cache:
+            names, sizes, mtimes, frames = cache["names"], cache["sizes"], cache["mtimes"], cache["frames"]
+            line_counts, line_keypoints, line_values = cache["line_counts"], cache["line_keypoints"], cache["line_values"]
+    except Exception:
+        return entries
+
+    # a different keypoint model or element count invalidates the whole cache
+    if frames.shape[1:] != (part, elem):
+        return entries
+
+    line_offsets = np.concatenate(([0], np.cumsum(line_counts)))
+    for t in range(len(names)):
+        lines = list(zip(line_keypoints[line_offsets[t]:line_offsets[t+1]], line_values[line_offsets[t]:line_offsets[t+1]]))
+        entries[names[t]] = (sizes[t], mtimes[t], frames[t], lines)
+
+    return entries
+
+
+# Save named arrays to an .npz file atomically, through a temporary file renamed over it, so that a reader never finds it half written
+def saveArrays(path, compress=False, **arrays):
+    with open(path + ".tmp", 'wb') as fp:
+        (np.savez_compressed if compress else np.savez)(fp, **arrays)
+    os.rename(path + ".tmp", path)
+
+
+# Write the parsed frames and keypoint lines of a list of log files to a cache file, atomically
+def writeCache(cache_path, names, sizes, mtimes, frames, lines):
+    cache_folder_path = os.path.dirname(cache_path)
+    if cache_folder_path and not os.path.exists(cache_folder_path):
+        os.makedirs(cache_folder_path)
+
+    line_keypoints = [ body_part for file_lines in lines for body_part, _ in file_lines ]
+    line_values = [ values for file_lines in lines for _, values in file_lines ]
+    saveArrays(cache_path,
+               names=np.array(names), sizes=np.array(sizes, dtype=np.int64), mtimes=np.array(mtimes, dtype=np.float64), frames=frames,
+               line_counts=np.array([ len(file_lines) for file_lines in lines ], dtype=np.int64),
+               line_keypoints=np.array(line_keypoints), line_values=np.array(line_values))
+
+
+# Parse a list of log files in [frame][keypoint][element] blocks, reusing the cached frames of every file whose size and mtime did not change
+def iterLogFiles(paths, part, elem, name_to_index, cache_path, on_line=None, block_size=256):
+    cached = readCache(cache_path, part, elem)
+    names, sizes, mtimes, lines, blocks = [], [], [], [], []
+    rebuild = len(cached) != len(paths)
+
+    for start in range(0, len(paths), block_size):
+        block = np.full((len(paths[start:start+block_size]), part, elem), np.nan)
+
+        for t, path in enumerate(paths[start:start+block_size]):
+            name, stat = os.path.basename(path), os.stat(path)
+            entry = cached.get(name)
+
+            if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime:
+                block[t] = entry[2]
+                file_lines = entry[3]
+            else:
+                file_lines = []
+                log_parser.parseLogFile(path, block[t], name_to_index, on_line=lambda body_part, coords_and_prob: file_lines.append((body_part, ",".join(coords_and_prob))))
+                rebuild = True
+
+            # replay the keypoint lines, whether they were cached or just parsed
+            if on_line:
+                for body_part, values in file_lines:
+                    on_line(body_part, values.split(","))
+
+            names.append(name)
+            sizes.append(stat.st_size)
+            mtimes.append(stat.st_mtime)
+            lines.append(file_lines)
+
+        blocks.append(block)
+        yield block
+
+    # the cache is only rewritten once every block has been consumed
+    if rebuild:
+        writeCache(cache_path, names, sizes, mtimes, np.concatenate(blocks) if blocks else np.full((0, part, elem), np.nan), lines)
+
+
+# Parse a list of log files like log_parser.parseLogFiles, reusing the cached frames of every file whose size and mtime did not change
+def parseLogFiles(paths, part, elem, name_to_index, cache_path, on_line=None):
+    blocks = list(iterLogFiles(paths, part, elem, name_to_index, cache_path, on_line))
+    if not blocks:
+        return np.full((0, part, elem), np.nan)
+    return np.concatenate(blocks)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+
+# python modules
+import os
+import time
+import bisect
+import calendar
+import numpy as np
+
+# local modules
+import log_cache
+
+
+# Format of the timestamps that follow the tag of the log file names, e.g. "OP Thu Jan 31 15:30:00 2019.txt"
+timestamp_format = "%a %b %d %H:%M:%S %Y"
+
+
+# Parse a log file timestamp, with or without its file extension, into seconds since the epoch, or None if it is not one
+def parseTimestamp(stamp):
+    try:
+        return float(calendar.timegm(time.strptime(os.path.splitext(stamp)[0].strip(), timestamp_format)))
+    except ValueError:
+        return None
+
+
+# Chronological index of the log files of a folder, named "<tag> <timestamp>": their names, tags, timestamps and times, sorted by time
+class LogIndex(object):
+
+    def __init__(self, folder_path, names, tags, stamps, times):
+        order = sorted(range(len(names)), key=lambda k: (times[k], names[k]))
+        self.folder_path = folder_path
+        self.names = [ names[k] for k in order ]
+        self.tags = [ tags[k] for k in order ]
+        self.stamps = [ stamps[k] for k in order ]
+        self.times = [ times[k] for k in order ]
+
+    # Return the path of the k-th log file
+    def path(self, k):
+        return os.path.join(self.folder_path, self.names[k])
+
+    # Return the range of positions of the log files whose times fall in [start, stop), found by bisection
+    def span(self, start=None, stop=None):
+        lo = 0 if start is None else bisect.bisect_left(self.times, start)
+        hi = len(self.times) if stop is None else bisect.bisect_left(self.times, stop)
+        return lo, max(lo, hi)
+
+    # Return the positions of the log files in [start, stop) with one of the given tags, or any, whose timestamp starts with prefix, in time order
+    def select(self, tags=None, prefix="", start=None, stop=None):
+        lo, hi = self.span(start, stop)
+        return [ k for k in range(lo, hi) if (tags is None or self.tags[k] in tags) and self.stamps[k].startswith(prefix) ]
+
+
+# Read an index file into its folder's modification time and a {file name: time} dictionary, or (None, {}) if it is missing or unreadable
+def readIndex(index_path):
+    if not index_path or not os.path.isfile(index_path):
+        return None, {}
+
+    try:
+        with np.load(index_path) as index:
+            return float(index["folder_mtime"]), dict(zip(index["names"].tolist(), index["times"].tolist()))
+    except Exception:
+        return None, {}
+
+
+# Write the file names and times of an index to an index file, atomically
+def writeIndex(index_path, folder_mtime, index):
+    log_cache.saveArrays(index_path, folder_mtime=np.float64(folder_mtime), names=np.array(index.names), times=np.array(index.times, dtype=np.float64))
+
+
+# Index the log files of a folder. Given an index file, the folder is not even listed while its modification time is unchanged,
+# and otherwise only the timestamps of the files that are new to the index are parsed
+def indexLogFolder(folder_path, index_path=None):
+    # the index file lives outside the indexed folder or in a subfolder of it, which has to exist before the folder's modification time is read
+    index_folder_path = os.path.dirname(index_path) if index_path else None
+    if index_folder_path and not os.path.exists(index_folder_path):
+        os.makedirs(index_folder_path)
+    folder_mtime = os.stat(folder_path).st_mtime
+    indexed_mtime, indexed = readIndex(index_path)
+
+    names, tags, stamps, times = [], [], [], []
+    for name in (sorted(indexed) if indexed_mtime == folder_mtime else os.listdir(folder_path)):
+        tag, _, stamp = name.partition(" ")
+        file_time = indexed[name] if name in indexed else parseTimestamp(stamp)
+        if file_time is None or (indexed_mtime != folder_mtime and not os.path.isfile(os.path.join(folder_path, name))):
+            continue
+        names.append(name)
+        tags.append(tag)
+        stamps.append(stamp)
+        times.append(file_time)
+
+    index = LogIndex(folder_path, names, tags, stamps, times)
+    if index_path and indexed_mtime != folder_mtime:
+        writeIndex(index_path, folder_mtime, index)
+    return index
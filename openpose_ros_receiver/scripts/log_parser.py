@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+
+# python modules
+import re
+import numpy as np
+
+
+# Patterns of the receiver's "Body N keypoints:" / "kp Name: x=... y=... z=..." log format, compiled once
+keypoint_line_pattern = re.compile(r'^kp (.*):(.*)$', re.MULTILINE)
+keypoint_value_pattern = re.compile(r'[-+]?\d+\.\d+')
+
+
+# Parse a log file into a preallocated [keypoint][element] frame, calling on_line(body_part, values) per keypoint line
+def parseLogFile(path, frame, name_to_index, on_line=None):
+    elem = frame.shape[1]
+    with open(path, 'r') as fp:
+        text = fp.read()
+
+    for match in keypoint_line_pattern.finditer(text):
+        body_part = match.group(1)
+        # the keypoint name carries no decimal numbers, so the values are the decimals after it
+        coords_and_prob = keypoint_value_pattern.findall(match.group(2))
+        values = [ float(v) for v in coords_and_prob[0:elem] ]
+        frame[ name_to_index[body_part], 0:len(values) ] = values
+
+        if on_line:
+            on_line(body_part, coords_and_prob)
+
+    return frame
+
+
+# Parse a list of log files into a NaN-initialized [frame][keypoint][element] ndarray
+def parseLogFiles(paths, part, elem, name_to_index, on_line=None):
+    frames = np.full((len(paths), part, elem), np.nan)
+    for t, path in enumerate(paths):
+        parseLogFile(path, frames[t], name_to_index, on_line)
+
+    return frames
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+# python modules
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+
+# Mask the keypoints of a [...][keypoint][x/y/prob] array that OpenPose actually detected
+def visibleKeypoints(poses):
+    return ~np.isnan(poses[..., 0:2]).any(axis=-1) & (np.nan_to_num(poses[..., 2]) > 0)
+
+
+# Mean distance of the keypoints that each track and each person both show, as a [track][person] cost matrix, inf where they share none
+def poseDistances(track_poses, poses):
+    shared = visibleKeypoints(track_poses)[:, np.newaxis, :] & visibleKeypoints(poses)[np.newaxis, :, :]
+    distances = np.sqrt(((track_poses[:, np.newaxis, :, 0:2] - poses[np.newaxis, :, :, 0:2]) ** 2).sum(axis=3))
+    counts = shared.sum(axis=2)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        costs = np.where(shared, distances, 0.0).sum(axis=2) / counts
+    costs[counts == 0] = np.inf
+    return costs
+
+
+# Link the people of consecutive [person][keypoint][x/y/prob] frames into tracks, returning each frame's per-person track ids
+def trackPeople(frames, max_distance=100.0, max_gap=10):
+    track_poses, track_last_frames, assignments = [], [], []
+
+    for t, poses in enumerate(frames):
+        poses = np.asarray(poses, dtype=np.float64)
+        track_ids = np.full(len(poses), -1, dtype=np.intp)
+
+        # match the frame's people to the tracks seen within the last max_gap frames, all at once
+        active = np.array([ k for k in range(len(track_poses)) if t - track_last_frames[k] <= max_gap ], dtype=np.intp)
+        if len(active) and len(poses):
+            costs = poseDistances(np.array([ track_poses[k] for k in active ]), poses)
+            # the solver needs finite costs, so gated pairs cost more than any assignment of allowed pairs
+            gated = costs <= max_distance
+            rows, cols = linear_sum_assignment(np.where(gated, costs, (np.nanmax(np.where(gated, costs, 0.0)) + 1.0) * (min(costs.shape) + 1)))
+            matched = gated[rows, cols]
+            track_ids[ cols[matched] ] = active[ rows[matched] ]
+
+        # unmatched people start new tracks
+        for p in np.flatnonzero(track_ids < 0):
+            track_ids[p] = len(track_poses)
+            track_poses.append(np.full(poses.shape[1:], np.nan))
+            track_last_frames.append(t)
+
+        # keep the last seen position of every keypoint, so that occluded ones can still be matched later on
+        visible = visibleKeypoints(poses)
+        for p, k in enumerate(track_ids):
+            track_poses[k][ visible[p] ] = poses[p][ visible[p] ]
+            track_last_frames[k] = t
+
+        assignments.append(track_ids)
+
+    return assignments
+
+
+# Gather the people of each track into a [frame][keypoint][x/y/prob] array spanning its first to last frame, NaN where it was not seen
+def buildTracks(frames, assignments):
+    tracks = int(max([ track_ids.max() + 1 for track_ids in assignments if len(track_ids) ] + [0]))
+    first_frames, last_frames = np.full(tracks, len(frames), dtype=np.intp), np.full(tracks, -1, dtype=np.intp)
+    for t, track_ids in enumerate(assignments):
+        first_frames[track_ids] = np.minimum(first_frames[track_ids], t)
+        last_frames[track_ids] = t
+
+    shape = next( (np.shape(poses)[1:] for poses in frames if len(poses)), (0, 0) )
+    trajectories = [ np.full((last_frames[k] - first_frames[k] + 1,) + tuple(shape), np.nan) for k in range(tracks) ]
+    for t, (poses, track_ids) in enumerate(zip(frames, assignments)):
+        for p, k in enumerate(track_ids):
+            trajectories[k][ t - first_frames[k] ] = poses[p]
+
+    return first_frames, trajectories
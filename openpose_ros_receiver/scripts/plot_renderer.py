@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+
+# python modules
+import os
+import hashlib
+import importlib
+import marshal
+import multiprocessing
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+import numpy as np
+
+# local modules
+import log_cache
+
+
+# The plotting stack, imported all at once by the first plot that is drawn, so that runs without plots never pay for it
+plotting_backend = 'Agg'
+plotting_modules = [ "matplotlib.pyplot" ]
+plotting_setup = []
+loaded_modules = {}
+
+
+# Run a function, e.g. one that sets the seaborn palette, as soon as the plotting stack is imported
+def afterLoading(function):
+    plotting_setup.append(function)
+    if loaded_modules:
+        function()
+
+
+# Import the plotting stack, once
+def loadPlotting():
+    if not loaded_modules:
+        import matplotlib
+        matplotlib.use(plotting_backend)
+        for name in plotting_modules:
+            loaded_modules[name] = importlib.import_module(name)
+        for function in plotting_setup:
+            function()
+    return loaded_modules
+
+
+# A module of the plotting stack that stands in for it until one of its attributes is used, e.g. plt = LazyModule("matplotlib.pyplot")
+class LazyModule(object):
+
+    def __init__(self, name):
+        self.name = name
+        if name not in plotting_modules:
+            plotting_modules.append(name)
+
+    def __getattr__(self, attribute):
+        return getattr(loadPlotting()[self.name], attribute)
+
+
+# The file a plot function of these scripts saves its figure to: its path, or its directory and title, if known
+def plotOutput(kwargs):
+    if "path" in kwargs:
+        return kwargs["path"]
+    if "directory" in kwargs and "title" in kwargs:
+        return kwargs["directory"] + kwargs["title"] + ".png"
+    return None
+
+
+# Read a plot cache file into an {output file: digest} dictionary, or an empty one if it is missing or unreadable
+def readPlotCache(cache_path):
+    if not os.path.isfile(cache_path):
+        return {}
+
+    try:
+        with np.load(cache_path) as cache:
+            return dict(zip(cache["outputs"].tolist(), cache["digests"].tolist()))
+    except Exception:
+        return {}
+
+
+# Write the digests of the rendered plots to a cache file, atomically
+def writePlotCache(cache_path, digests):
+    cache_folder_path = os.path.dirname(cache_path)
+    if cache_folder_path and not os.path.exists(cache_folder_path):
+        os.makedirs(cache_folder_path)
+
+    outputs = sorted(digests)
+    log_cache.saveArrays(cache_path, outputs=np.array(outputs), digests=np.array([ digests[output] for output in outputs ]))
+
+
+# A plot function call with its data and labels, pickled when specified so that later changes to the data cannot leak into it,
+# and digested along with the function's code, so that an unchanged plot can be told apart from a changed one
+class PlotSpec(object):
+
+    def __init__(self, function, *args, **kwargs):
+        self.payload = pickle.dumps((function, args, kwargs), pickle.HIGHEST_PROTOCOL)
+        self.output = plotOutput(kwargs)
+        self.digest = hashlib.sha1(marshal.dumps(function.__code__) + self.payload).hexdigest()
+
+    # Draw and save the plot, then release its figures
+    def render(self):
+        function, args, kwargs = pickle.loads(self.payload)
+        plt = loadPlotting()["matplotlib.pyplot"]
+        function(*args, **kwargs)
+        plt.close('all')
+
+
+# Render a plot spec, as a pool maps a single argument
+def renderPlotSpec(spec):
+    spec.render()
+
+
+# Collect plot specs and render them at once, in a pool of worker processes if more than one worker is requested, or drop them if plotting is disabled.
+# Given a cache file, skip the plots whose output exists and whose function and inputs did not change since they were last rendered
+class PlotRenderer(object):
+
+    def __init__(self, workers=None, enabled=True, cache_path=None):
+        self.workers = multiprocessing.cpu_count() if workers is None else workers
+        self.enabled = enabled
+        self.cache_path = cache_path
+        self.specs = []
+
+    # Queue a call of a plot function, e.g. add(boxplot, data=..., title=...)
+    def add(self, function, *args, **kwargs):
+        if self.enabled:
+            self.specs.append(PlotSpec(function, *args, **kwargs))
+
+    # Render the queued plots and empty the queue
+    def render(self):
+        specs, self.specs = self.specs, []
+        if not specs:
+            return
+        # a later plot of an output overwrites the earlier ones, so render only the last, rather than have several workers write the file at once
+        last = dict( (spec.output, k) for k, spec in enumerate(specs) )
+        specs = [ spec for k, spec in enumerate(specs) if spec.output is None or last[spec.output] == k ]
+
+        digests = readPlotCache(self.cache_path) if self.cache_path else {}
+        stale = [ spec for spec in specs if spec.output is None or digests.get(spec.output) != spec.digest or not os.path.isfile(spec.output) ]
+
+        if stale:
+            # import the plotting stack before forking, so that the workers share it
+            loadPlotting()
+        if self.workers > 1 and len(stale) > 1:
+            pool = multiprocessing.Pool(processes=min(self.workers, len(stale)))
+            try:
+                pool.map(renderPlotSpec, stale, chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            for spec in stale:
+                spec.render()
+
+        if self.cache_path:
+            digests.update( (spec.output, spec.digest) for spec in specs if spec.output is not None )
+            writePlotCache(self.cache_path, digests)
@@ -2,14 +2,27 @@
 
 # python modules
 import os
-import re
+import glob
+import argparse
 import math
 import time
+import multiprocessing
 import numpy as np
-from scipy import stats as stats
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-import seaborn as sns
+
+# local modules
+import log_cache
+import log_index
+import run_archive
+import csv_buffer
+import streaming_stats
+import stats_engine
+import keypoint_models
+import plot_renderer
+
+# plotting modules, imported by the first plot that is drawn
+plt = plot_renderer.LazyModule("matplotlib.pyplot")
+mplot3d = plot_renderer.LazyModule("mpl_toolkits.mplot3d")
+sns = plot_renderer.LazyModule("seaborn")
 
 
 # Get a list of keys from dictionary which has the given value
@@ -22,6 +35,21 @@ def getKeysByValue(dictOfElements, valueToFind):
     return listOfKeys
 
 
+# Mask the frames at which every given coordinate array was observed, so that x/y/z stay aligned
+def jointMask(*coords):
+    mask = np.ones(np.shape(coords[0]), dtype=bool)
+    for coord in coords:
+        mask &= ~np.isnan(np.asarray(coord, dtype=np.float64))
+    return mask
+
+
+# Keep the frames of an [x, y(, z)] series at which every coordinate was observed
+def observedSeries(series):
+    coords = [ np.asarray(coord, dtype=np.float64) for coord in series ]
+    mask = jointMask(*coords)
+    return [ coord[mask] for coord in coords ]
+
+
 # Bubble sort up to three parallel lists based on the first list's values
 def bubbleSortParallelLists(a_list, b_list, c_list=None):
     # sanity check
@@ -115,12 +143,11 @@ def multiplot(x, y_data, directory, y_names=None, x_label=None, y_label=None, ti
 def scatterplot2D(x, y, directory, x_label=None, y_label=None, title=None, x_lim_min=None, x_lim_max=None, y_lim_min=None, y_lim_max=None):
     fig = plt.figure()
     ax = fig.add_subplot(111)
-    ax.scatter(x, y, c='r', marker='o')
-    # number of index to markers
-    i = 0
-    for x_i, y_i in zip(np.array(x)[~np.isnan(np.array(x))], np.array(y)[~np.isnan(np.array(y))]):
-        ax.text(x_i, y_i, str(i), fontsize=8)
-        i = i+1
+    # one collection of the frames at which both coordinates were observed, coloured by frame
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    frames = np.flatnonzero(jointMask(x, y))
+    markers = ax.scatter(x[frames], y[frames], c=frames, cmap='autumn', marker='o')
+    fig.colorbar(markers, ax=ax).set_label("Frame", fontsize=8)
     if x_label:
         ax.set_xlabel(x_label, fontsize=8)
     if y_label:
@@ -140,12 +167,11 @@ def scatterplot2D(x, y, directory, x_label=None, y_label=None, title=None, x_lim
 def scatterplot3D(x, y, z, directory, x_label=None, y_label=None, z_label=None, title=None, x_lim_min=None, x_lim_max=None, y_lim_min=None, y_lim_max=None, z_lim_min=None, z_lim_max=None):
     fig = plt.figure()
     ax = fig.add_subplot(111, projection='3d')
-    ax.scatter(x, y, z, c='r', marker='o')
-    # number of index to markers
-    i = 0
-    for x_i, y_i, z_i in zip(np.array(x)[~np.isnan(np.array(x))], np.array(y)[~np.isnan(np.array(y))], np.array(z)[~np.isnan(np.array(z))]):
-        ax.text(x_i, y_i, z_i, str(i), fontsize=8)
-        i = i+1
+    # one collection of the frames at which all three coordinates were observed, coloured by frame
+    x, y, z = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64), np.asarray(z, dtype=np.float64)
+    frames = np.flatnonzero(jointMask(x, y, z))
+    markers = ax.scatter(x[frames], y[frames], z[frames], c=frames, cmap='autumn', marker='o')
+    fig.colorbar(markers, ax=ax, shrink=0.8).set_label("Frame", fontsize=8)
     if x_label:
         ax.set_xlabel(x_label, fontsize=8)
     if y_label:
@@ -173,6 +199,9 @@ def multiscatterplot2D(data, directory, names=None, x_label=None, y_label=None,
             'royalblue', 'navy', 'lightcoral', 'brown', 'y',
             'limegreen', 'teal', 'steelblue', 'darkmagenta', 'peru']
 
+    # keep each series' frames at which all of its coordinates were observed
+    data = [ observedSeries(d) for d in data ]
+
     fig = plt.figure()
     ax = fig.add_subplot(111)
     if border_idx:
@@ -234,6 +263,9 @@ def multiscatterplot3D(data, directory, names=None, x_label=None, y_label=None,
             'royalblue', 'navy', 'lightcoral', 'brown', 'y',
             'limegreen', 'teal', 'steelblue', 'darkmagenta', 'peru']
 
+    # keep each series' frames at which all of its coordinates were observed
+    data = [ observedSeries(d) for d in data ]
+
     fig = plt.figure()
     ax = fig.add_subplot(111)
     ax = fig.gca(projection='3d')
@@ -296,6 +328,9 @@ def multiscatterplot3D(data, directory, names=None, x_label=None, y_label=None,
 
 # Define a function for a 2D multi-skeletonplot
 def skeletonplot2D(data, directory, names=None, x_label=None, y_label=None, title=None, x_lim_min=None, x_lim_max=None, y_lim_min=None, y_lim_max=None, border_idx=None):
+    # keep each series' frames at which all of its coordinates were observed
+    data = [ observedSeries(d) for d in data ]
+
     fig = plt.figure()
     ax = fig.add_subplot(111)
     if border_idx:
@@ -344,6 +379,9 @@ def skeletonplot2D(data, directory, names=None, x_label=None, y_label=None, titl
 
 # Define a function for a 3D skeleton plot
 def skeletonplot3D(data, directory, names=None, x_label=None, y_label=None, z_label=None, title=None, x_lim_min=None, x_lim_max=None, y_lim_min=None, y_lim_max=None, z_lim_min=None, z_lim_max=None, border_idx=None):
+    # keep each series' frames at which all of its coordinates were observed
+    data = [ observedSeries(d) for d in data ]
+
     fig = plt.figure()
     ax = fig.add_subplot(111)
     ax = fig.gca(projection='3d')
@@ -411,20 +449,6 @@ def histogram(data, directory, x_label=None, y_label=None, title=None):
     plt.close(fig)
 
 
-# Simulate a function for a boxplot to find mins and maxes of caps
-def simboxplot(data):
-    if not data:
-        return
-    fig = plt.figure()
-    ax = fig.add_subplot(111)
-    data_dict = ax.boxplot(data)
-    temp_y_lim_min = np.nanmin([c.get_ydata()[0] for c in data_dict["caps"]])    # caps: the horizontal lines at the ends of the whiskers.
-    temp_y_lim_max = np.nanmax([c.get_ydata()[0] for c in data_dict["caps"]])    # caps: the horizontal lines at the ends of the whiskers.
-    plt.close(fig)
-
-    return temp_y_lim_min, temp_y_lim_max
-
-
 # Define a function for a boxplot
 def boxplot(data, directory, data_label=None, y_label=None, title=None, x_tick_labels=None, y_lim_min=None, y_lim_max=None, optimize_lims=False):
     if not data:
@@ -440,6 +464,9 @@ def boxplot(data, directory, data_label=None, y_label=None, title=None, x_tick_l
         ax.set_xticklabels(x_tick_labels, rotation=45, ha="right", fontsize=8)
     if title:
         ax.set_title(title, fontsize=10)
+    # fit the limits to the whisker caps, unless they are given
+    if optimize_lims and y_lim_min is None and y_lim_max is None:
+        y_lim_min, y_lim_max = stats_engine.whiskerLimits(data)
     if y_lim_min and y_lim_max and y_lim_min != y_lim_max:
         # to distance a bit the margins of the plot from the caps
         if optimize_lims:
@@ -455,96 +482,74 @@ def boxplot(data, directory, data_label=None, y_label=None, title=None, x_tick_l
 # MAIN FUNCTION
 
 
-if __name__ == "__main__":
-    # expand the color palette for the plots, once and for all
-    sns.set_palette(sns.color_palette("hls", 25))
-
-    # Body 25 human pose model specific variables
-    body_25_body_parts_dict = dict([ (0,  "Nose"), (1,  "Neck"), (2,  "RShoulder"), (3,  "RElbow"), (4,  "RWrist"),
-                                     (5,  "LShoulder"), (6,  "LElbow"), (7,  "LWrist"), (8,  "MidHip"), (9,  "RHip"),
-                                     (10, "RKnee"), (11, "RAnkle"), (12, "LHip"), (13, "LKnee"), (14, "LAnkle"),
-                                     (15, "REye"), (16, "LEye"), (17, "REar"), (18, "LEar"), (19, "LBigToe"),
-                                     (20, "LSmallToe"), (21, "LHeel"), (22, "RBigToe"), (23, "RSmallToe"), (24, "RHeel"),
-                                     (25, "Background")
-                                    ])
-    body_25_body_part_pairs = [ [1, 8], [1, 2], [1, 5], [2, 3], [3, 4], [5, 6], [6, 7],
-                                [8, 9], [9, 10], [10, 11], [8, 12], [12, 13], [13, 14], [1, 0],
-                                [0, 15], [15, 17], [0, 16], [16, 18], [14, 19],
-                                [19, 20], [14, 21], [11, 22], [22, 23], [11, 24]
-                            ]
-    body_25_body_parts_LR_order_of_appearance = [ '4', '23', '3', '22', '11', '2', '10', '9', '24', '17', '15', '8', '1', '0', '16', '18', '21', '12', '13', '14', '19', '5', '6', '20', '7' ]
-    body_25_upper_body_parts_LR_order_of_appearance = [ '4', '3', '2', '9', '17', '15', '8', '1', '0', '16', '18', '12', '5', '6', '7' ]
-
-    # OpenPose specific variables
-    element_dict = dict([ (0, "x"), (1, "y"), (2, "z"), (3, "certainty") ])
-
-    # File I/O specific variables
-    # output_path = "/home/gkamaras/catkin_ws/src/openpose_ros/openpose_ros_receiver/output/"
-    # output_path = "/home/gkamaras/catkin_ws/src/openpose_ros/openpose_ros_receiver/output/SCENARIOS/ZED_HD720/logs/"
-    output_path = "/home/gkamaras/catkin_ws/src/openpose_ros/openpose_ros_receiver/output/old_takes/"
-    ''''''
-    # output_subfolder = "take46QueueSize100/"
-    # op_output_file_prefix = "OP Thu Feb 14 15:16:"
-    # raw_output_file_prefix = "raw Thu Feb 14 15:16:"
-    # tfed_output_file_prefix = "tfed Thu Feb 14 15:16:"
-    ''''''
-    # output_subfolder = "A-FV-ST-V-C-up/"
-    # op_output_file_prefix = "OP Wed Apr 10 12:1"
-    # raw_output_file_prefix = "raw Wed Apr 10 12:1"
-    # tfed_output_file_prefix = "tfed Wed Apr 10 12:1"
-    ''''''
-    output_subfolder = "take24/"
-    op_output_file_prefix = "OP Thu Jan 31 15:3"
-    raw_output_file_prefix = "raw Thu Jan 31 15:3"
-    tfed_output_file_prefix = "tfed Thu Jan 31 15:3"
-    ''''''
-
-    output_folder_path = output_path + output_subfolder
-
-    ''''''
-    label_postfix, output_file_prefix = "pix", op_output_file_prefix
-    csv_folder_path = output_folder_path + "csvOP/"
-    plots_folder_path = output_folder_path + "plotsOP/"
-    statistics_folder_path = output_folder_path + "statisticsOP/"
-    ''''''
-    # label_postfix, output_file_prefix = "cam", raw_output_file_prefix
-    # csv_folder_path = output_folder_path + "csvRAW/"
-    # plots_folder_path = output_folder_path + "plotsRAW/"
-    # statistics_folder_path = output_folder_path + "statisticsRAW/"
-    ''''''
-    # label_postfix, output_file_prefix = "rob", tfed_output_file_prefix
-    # csv_folder_path = output_folder_path + "csvTFED/"
-    # plots_folder_path = output_folder_path + "plotsTFED/"
-    # statistics_folder_path = output_folder_path + "statisticsTFED/"
-    ''''''
-
-    # create our 3d report matrix, e.g. for 10 log frames: [BodyPart][x/y/z/prob][t0,...,t9,mean,nobs,min,max,variance,skewness,kurtosis,std_dev] --> 25 * 4 * 18
-    ''''''
-    # max_logs = 10
-    # part, elem, val = 25, 4, 18
-    # stat_analysis_idx, mean_idx, nobs_idx, min_idx, max_idx, variance_idx, skewness_idx, kurtosis_idx, std_dev_idx = 10, 10, 11, 12, 13, 14, 15, 16, 17
-    ''''''
-    max_logs = 15
-    part, elem, val = 25, 4, 23
-    stat_analysis_idx, mean_idx, nobs_idx, min_idx, max_idx, variance_idx, skewness_idx, kurtosis_idx, std_dev_idx = 15, 15, 16, 17, 18, 19, 20, 21, 22
-    ''''''
-    # max_logs = 40
-    # part, elem, val = 25, 4, 48
-    # stat_analysis_idx, nobs_idx, min_idx, max_idx, mean_idx, variance_idx, skewness_idx, kurtosis_idx, std_dev_idx = 40, 40, 41, 42, 43, 44, 45, 46, 47
-    ''''''
-    # max_logs = 60
-    # part, elem, val = 25, 4, 68
-    # stat_analysis_idx, nobs_idx, min_idx, max_idx, mean_idx, variance_idx, skewness_idx, kurtosis_idx, std_dev_idx = 60, 60, 61, 62, 63, 64, 65, 66, 67
-    ''''''
-
-    report_matrix = [ [ [ np.nan for k in range(val) ] for j in range(elem) ] for i in range(part) ]
+# expand the color palette for the plots, once and for all, as soon as they are drawn
+plot_renderer.afterLoading(lambda: sns.set_palette(sns.color_palette("hls", 25)))
+
+# Body 25 human pose model specific variables
+body_25_model = keypoint_models.BODY_25
+body_25_body_parts_dict = body_25_model.parts_dict
+body_25_body_part_pairs = body_25_model.pairs
+body_25_upper_body_parts = body_25_model.subsets["upper_body"]
+body_25_upper_body_parts_LR_order = body_25_model.orders["upper_body_LR"]
+body_25_upper_body_parts_LR_order_of_appearance = [ str(i) for i in body_25_upper_body_parts_LR_order ]
+
+# OpenPose specific variables
+element_dict = dict([ (0, "x"), (1, "y"), (2, "z"), (3, "certainty") ])
+
+# Log streams of a take: the tag their file names start with, and the postfix of their plot labels
+streams_dict = dict([ ("OP", ("OP", "pix")), ("RAW", ("raw", "cam")), ("TFED", ("tfed", "rob")) ])
+
+
+# Classify the log files of a take, named "<tag> <timestamp>", by stream from the take's chronological log index, keeping those whose timestamp starts
+# with output_file_prefix and whose time falls in [start, stop), and only the first max_logs of each stream if asked to. Returns the timestamps
+# of the take's frames, in time order, and for each stream the path of its log file at each frame, None where it has none
+def scanTakeLogs(output_folder_path, output_file_prefix="", streams=None, max_logs=None, start=None, stop=None):
+    streams = streams or sorted(streams_dict)
+    tags = dict( (streams_dict[stream][0], stream) for stream in streams )
+    index = log_index.indexLogFolder(output_folder_path, output_folder_path + "cache/" + "log_index.npz")
+
+    stamps, seen, stream_paths = [], set(), dict( (stream, {}) for stream in streams )
+    for k in index.select(tags, output_file_prefix, start, stop):
+        # keep only the first max_logs log files of each stream, before the streams' timestamps are merged
+        if max_logs and len(stream_paths[ tags[index.tags[k]] ]) >= max_logs:
+            continue
+        if index.stamps[k] not in seen:
+            seen.add(index.stamps[k])
+            stamps.append(index.stamps[k])
+        stream_paths[ tags[index.tags[k]] ][ index.stamps[k] ] = index.path(k)
+
+    return stamps, dict( (stream, [ stream_paths[stream].get(stamp) for stamp in stamps ]) for stream in streams )
+
+
+# Process the log files of a take's stream (OP, RAW or TFED), named "<tag> <output_file_prefix>...", into CSVs, statistics and plots.
+# The frames follow the timestamps of take_logs, as scanned by scanTakeLogs for every stream processed together, or else of this stream's log files.
+# With archive, the frames, statistics and z-table are also written to a single "statistics<stream>/report" archive file, which can replace the per-keypoint CSVs
+def processTake(output_folder_path, stream="OP", output_file_prefix="", max_logs=None, plot_workers=None, stats_only=False, plot_cache=True, take_logs=None,
+                archive=False, export_csvs=True):
+    label_postfix = streams_dict[stream][1]
+    csv_folder_path = output_folder_path + "csv" + stream + "/"
+    plots_folder_path = output_folder_path + "plots" + stream + "/"
+    statistics_folder_path = output_folder_path + "statistics" + stream + "/"
+    cache_folder_path = output_folder_path + "cache" + stream + "/"
+    # the archive goes in a subfolder, since writing to the take folder would change its modification time and invalidate its log index
+    archive_path = statistics_folder_path + "report" + run_archive.archiveExtension()
+
+    # our 3d report matrix grows with the log frames: [BodyPart][x/y/z/prob][t0,...,tN] --> 25 * 4 * N,
+    # while the statistics of each body part element are accumulated while streaming: nobs,min,max,mean,variance,skewness,kurtosis,std_dev
+    part, elem = 25, 4
+    statistics_names = stats_engine.statistics_names
+
+    # Plotting specific variables
+    plots = plot_renderer.PlotRenderer(workers=plot_workers, enabled=not stats_only, cache_path=cache_folder_path + "plots.npz" if plot_cache else None)
+
+    body_25_body_parts_index = body_25_model.index
 
     # create CSVs directory
-    if not os.path.exists(csv_folder_path):
+    if export_csvs and not os.path.exists(csv_folder_path):
         os.makedirs(csv_folder_path)
 
     # create plots directory
-    if not os.path.exists(plots_folder_path):
+    if not stats_only and not os.path.exists(plots_folder_path):
         os.makedirs(plots_folder_path)
     
     # create statistics directory
@@ -552,10 +557,10 @@ if __name__ == "__main__":
         os.makedirs(statistics_folder_path)
 
     # create CSVs
-    for key, value in body_25_body_parts_dict.items():
+    for key, value in (body_25_body_parts_dict.items() if export_csvs else []):
         fp = open(csv_folder_path + value + "CoordsAndProb" + ".csv", 'w')
         fp.close()
-    for key, value in body_25_body_parts_dict.items():
+    for key, value in (body_25_body_parts_dict.items() if export_csvs else []):
         fp = open(csv_folder_path + value + ".csv", 'w')
         fp.close()
     
@@ -565,145 +570,108 @@ if __name__ == "__main__":
     fp = open(statistics_folder_path + "z_table.txt", 'w')
     fp.close()
 
-    # access the files of the output directory
-    file_counter = 0
-    for file in os.listdir(output_folder_path):
-
-        try:
-
-            if os.path.isfile(os.path.join(output_folder_path, file)) and output_file_prefix in file:
-
-                # read from file
-                with open( os.path.join(output_folder_path, file), 'r' ) as fp:
-
-                    for cnt, line in enumerate(fp):
-                        if "Body" not in line and line.strip():     # ignore header lines and empty lines
-                            body_part = re.search('kp (.*):', line).group(1)
-                            # source: https://stackoverflow.com/questions/678236/how-to-get-the-filename-without-the-extension-from-a-path-in-python
-                            coords_and_prob = re.findall(r'[-+]?\d+\.\d+', line)
-
-                            # write in the appropriate CSV
-                            with open(csv_folder_path + body_part + "CoordsAndProb" + ".csv", 'a') as fp:
-                                string = ""
-                                coord_or_prob_idx = 0
-                                for i in coords_and_prob:
-                                    if string.strip():
-                                        string = string + ","
-                                    string = string + str(i)
-
-                                    # fill report matrix
-                                    report_matrix[ getKeysByValue(body_25_body_parts_dict, body_part)[0] ][coord_or_prob_idx][file_counter] = float(i)
-
-                                    coord_or_prob_idx = coord_or_prob_idx + 1
-
-                                string = string + "\n"
-                                fp.write(string)
-            
-                file_counter = file_counter + 1
-
-                if file_counter == max_logs:
-                    break
-            
-        except Exception as e:
-            raise e
+    # access the files of the output directory, unless they were already scanned along with the other streams of the take
+    if take_logs is None:
+        take_logs = scanTakeLogs(output_folder_path, output_file_prefix, [ stream ], max_logs)
+    stamps, stream_logs = take_logs
+    log_files = [ path for path in stream_logs[stream] if path ]
+    log_frames = np.array([ t for t, path in enumerate(stream_logs[stream]) if path ], dtype=np.intp)
+
+    # buffer each keypoint line for the appropriate CSV
+    coords_and_prob_csvs = csv_buffer.BufferedCsvWriter()
+    def writeCoordsAndProb(body_part, coords_and_prob):
+        coords_and_prob_csvs.write(csv_folder_path + body_part + "CoordsAndProb" + ".csv", ",".join(coords_and_prob) + "\n")
+
+    # parse the log files block by block, or load them from the cache if they are unchanged, into growable storage and streaming statistics
+    frames = streaming_stats.ChunkedArray((part, elem))
+    moments = streaming_stats.StreamingMoments((part, elem))
+    for block in log_cache.iterLogFiles(log_files, part, elem, body_25_body_parts_index, cache_folder_path + "frames.npz", on_line=writeCoordsAndProb if export_csvs else None):
+        frames.append(block)
+        moments.update(block)
+
+    # write the CSVs, once per file
+    coords_and_prob_csvs.flush()
+
+    # fill the report matrix, with a frame per timestamp of the take, NaN wherever this stream has no log
+    aligned_frames = np.full((len(stamps), part, elem), np.nan)
+    aligned_frames[log_frames] = frames.toArray()
+    report_matrix = aligned_frames.transpose(1, 2, 0)
+    statistics = moments.statistics()
+    # the aligned frames, of every stream processed together, and this stream's own log frames, which its body parts' occurences count up to
+    logs = report_matrix.shape[2]
+    stream_logs = len(log_files)
 
 
     # do statistical analysis
     occurences_accross_frames = [ 0 for i in range(part) ]
-    certainty_accross_frames = [ [ 0.0 for j in range(stat_analysis_idx) ] for i in range(part) ]
+    certainty_accross_frames = [ [ 0.0 for j in range(logs) ] for i in range(part) ]
     mean_certainty_accross_frames = [ 0.0 for i in range(part) ]
-    z_table = [ [ [ np.nan for k in range(stat_analysis_idx) ] for j in range(elem) ] for i in range(part) ]
+    # fill z-table, at once for every body part element and log frame
+    z_table = stats_engine.zTable(report_matrix, statistics, axis=2)
 
     for i in range(part):
 
-        for j in range(elem):
-            # count the non-nan values
-            non_nans = (~np.isnan(report_matrix[i][j][0:stat_analysis_idx])).sum(0)
-            if not non_nans:
-                continue
-
-            # source: https://docs.scipy.org/doc/scipy/reference/generated/scipy.stats.describe.html
-            description = stats.describe(np.array(report_matrix[i][j][0:stat_analysis_idx])[~np.isnan(report_matrix[i][j][0:stat_analysis_idx])])
-            report_matrix[i][j][nobs_idx] = description.nobs
-            report_matrix[i][j][min_idx] = np.nanmin(report_matrix[i][j][0:stat_analysis_idx], axis=0)
-            report_matrix[i][j][max_idx] = np.nanmax(report_matrix[i][j][0:stat_analysis_idx], axis=0)
-            report_matrix[i][j][mean_idx] = description.mean
-            report_matrix[i][j][variance_idx] = description.variance
-            report_matrix[i][j][skewness_idx] = description.skewness
-            report_matrix[i][j][kurtosis_idx] = description.kurtosis
-            report_matrix[i][j][std_dev_idx] = np.std(np.array(report_matrix[i][j][0:stat_analysis_idx])[~np.isnan(report_matrix[i][j][0:stat_analysis_idx])])
-
-            # fill z-table
-            for k in range(stat_analysis_idx):
-                if not np.isnan(report_matrix[i][j][k]) and not np.isnan(report_matrix[i][j][mean_idx]) and not np.isnan(report_matrix[i][j][std_dev_idx]) and report_matrix[i][j][std_dev_idx] != 0:
-                    z_table[i][j][k] = (report_matrix[i][j][k] - report_matrix[i][j][mean_idx]) / report_matrix[i][j][std_dev_idx]
-                else:
-                    z_table[i][j][k] = np.nan
-        
-
         # Do a scatterplot of a certain body part's keypoints detected in space
-        if (~np.isnan(report_matrix[i][0][0:stat_analysis_idx])).sum(0) and (~np.isnan(report_matrix[i][1][0:stat_analysis_idx])).sum(0) and (~np.isnan(report_matrix[i][2][0:stat_analysis_idx])).sum(0):
-            scatterplot2D(  x=report_matrix[i][0][0:stat_analysis_idx], y=report_matrix[i][1][0:stat_analysis_idx],
-                            x_label='X'+label_postfix, y_label='Y'+label_postfix,
-                            title="Scatterplot of X"+label_postfix+", Y"+label_postfix+" at "+body_25_body_parts_dict.get(i),
-                            directory=plots_folder_path,
-                            # x_lim_min=np.nanmin(report_matrix[i][0][0:stat_analysis_idx]), x_lim_max=np.nanmax(report_matrix[i][0][0:stat_analysis_idx]),
-                            # y_lim_min=np.nanmin(report_matrix[i][1][0:stat_analysis_idx]), y_lim_max=np.nanmax(report_matrix[i][1][0:stat_analysis_idx])
-                        )
-
-            scatterplot3D(  x=report_matrix[i][0][0:stat_analysis_idx], y=report_matrix[i][1][0:stat_analysis_idx], z=report_matrix[i][2][0:stat_analysis_idx],
-                            x_label='X'+label_postfix, y_label='Y'+label_postfix, z_label='Z'+label_postfix,
-                            title="Scatterplot of X"+label_postfix+", Y"+label_postfix+", Z"+label_postfix+" at "+body_25_body_parts_dict.get(i),
-                            directory=plots_folder_path,
-                            x_lim_min=np.nanmin(report_matrix[i][0][0:stat_analysis_idx]), x_lim_max=np.nanmax(report_matrix[i][0][0:stat_analysis_idx]),
-                            y_lim_min=np.nanmin(report_matrix[i][1][0:stat_analysis_idx]), y_lim_max=np.nanmax(report_matrix[i][1][0:stat_analysis_idx]),
-                            z_lim_min=np.nanmin(report_matrix[i][2][0:stat_analysis_idx]), z_lim_max=np.nanmax(report_matrix[i][2][0:stat_analysis_idx])
-                        )
+        if (~np.isnan(report_matrix[i][0])).sum(0) and (~np.isnan(report_matrix[i][1])).sum(0) and (~np.isnan(report_matrix[i][2])).sum(0):
+            plots.add(scatterplot2D, x=report_matrix[i][0], y=report_matrix[i][1],
+                                     x_label='X'+label_postfix, y_label='Y'+label_postfix,
+                                     title="Scatterplot of X"+label_postfix+", Y"+label_postfix+" at "+body_25_body_parts_dict.get(i),
+                                     directory=plots_folder_path,
+                                     # x_lim_min=np.nanmin(report_matrix[i][0]), x_lim_max=np.nanmax(report_matrix[i][0]),
+                                     # y_lim_min=np.nanmin(report_matrix[i][1]), y_lim_max=np.nanmax(report_matrix[i][1])
+                                 )
+
+            plots.add(scatterplot3D, x=report_matrix[i][0], y=report_matrix[i][1], z=report_matrix[i][2],
+                                     x_label='X'+label_postfix, y_label='Y'+label_postfix, z_label='Z'+label_postfix,
+                                     title="Scatterplot of X"+label_postfix+", Y"+label_postfix+", Z"+label_postfix+" at "+body_25_body_parts_dict.get(i),
+                                     directory=plots_folder_path,
+                                     x_lim_min=np.nanmin(report_matrix[i][0]), x_lim_max=np.nanmax(report_matrix[i][0]),
+                                     y_lim_min=np.nanmin(report_matrix[i][1]), y_lim_max=np.nanmax(report_matrix[i][1]),
+                                     z_lim_min=np.nanmin(report_matrix[i][2]), z_lim_max=np.nanmax(report_matrix[i][2])
+                                 )
 
         # Do a boxplot for a certain body part's keypoints elements
         # first, sanitize data
-        x = np.array(report_matrix[i][0][0:stat_analysis_idx])[~np.isnan(np.array(report_matrix[i][0][0:stat_analysis_idx]))]
-        y = np.array(report_matrix[i][1][0:stat_analysis_idx])[~np.isnan(np.array(report_matrix[i][1][0:stat_analysis_idx]))]
-        z = np.array(report_matrix[i][2][0:stat_analysis_idx])[~np.isnan(np.array(report_matrix[i][2][0:stat_analysis_idx]))]
+        x = np.array(report_matrix[i][0])[~np.isnan(np.array(report_matrix[i][0]))]
+        y = np.array(report_matrix[i][1])[~np.isnan(np.array(report_matrix[i][1]))]
+        z = np.array(report_matrix[i][2])[~np.isnan(np.array(report_matrix[i][2]))]
         # second, plot them
-        boxplot(    data=[x, y, z],
-                    data_label=body_25_body_parts_dict.get(i),
-                    title="Boxplot of X"+label_postfix+", Y"+label_postfix+", Z"+label_postfix+" at "+body_25_body_parts_dict.get(i),
-                    directory=plots_folder_path,
-                    x_tick_labels=["X"+label_postfix, "Y"+label_postfix, "Z"+label_postfix]
-                )
+        plots.add(boxplot, data=[x, y, z],
+                           data_label=body_25_body_parts_dict.get(i),
+                           title="Boxplot of X"+label_postfix+", Y"+label_postfix+", Z"+label_postfix+" at "+body_25_body_parts_dict.get(i),
+                           directory=plots_folder_path,
+                           x_tick_labels=["X"+label_postfix, "Y"+label_postfix, "Z"+label_postfix]
+                       )
 
         # Count occurences accross log frames
         if label_postfix != "rob":
-            occurences_accross_frames[i] = (~np.isnan(report_matrix[i][ getKeysByValue(element_dict, "certainty")[0] ][0:stat_analysis_idx])).sum(0)
+            occurences_accross_frames[i] = (~np.isnan(report_matrix[i][ getKeysByValue(element_dict, "certainty")[0] ])).sum(0)
         else:
-            occurences_accross_frames[i] = (~np.isnan(report_matrix[i][ getKeysByValue(element_dict, "x")[0] ][0:stat_analysis_idx])).sum(0)
+            occurences_accross_frames[i] = (~np.isnan(report_matrix[i][ getKeysByValue(element_dict, "x")[0] ])).sum(0)
 
         # Log certainty accross frames
-        for k in range(stat_analysis_idx):
+        for k in range(logs):
             if ~np.isnan(report_matrix[i][ getKeysByValue(element_dict, "certainty")[0] ][k]):
                 certainty_accross_frames[i][k] = report_matrix[i][ getKeysByValue(element_dict, "certainty")[0] ][k]
         
         # Log mean certainty accross frames
-        if ~np.isnan(report_matrix[i][ getKeysByValue(element_dict, "certainty")[0] ][mean_idx]):
-            mean_certainty_accross_frames[i] = report_matrix[i][ getKeysByValue(element_dict, "certainty")[0] ][mean_idx]
+        if ~np.isnan(statistics["mean"][i][ getKeysByValue(element_dict, "certainty")[0] ]):
+            mean_certainty_accross_frames[i] = statistics["mean"][i][ getKeysByValue(element_dict, "certainty")[0] ]
 
 
     # # Collect the elements of each body part
     # x_col, y_col, z_col, certainty_col = [], [], [], []
     # for i in range(part):
-    #     x_col.append(report_matrix[i][ getKeysByValue(element_dict, "x")[0] ][0:stat_analysis_idx])
-    #     y_col.append(report_matrix[i][ getKeysByValue(element_dict, "y")[0] ][0:stat_analysis_idx])
-    #     z_col.append(report_matrix[i][ getKeysByValue(element_dict, "z")[0] ][0:stat_analysis_idx])
-    #     certainty_col.append(report_matrix[i][ getKeysByValue(element_dict, "certainty")[0] ][0:stat_analysis_idx])
+    #     x_col.append(report_matrix[i][ getKeysByValue(element_dict, "x")[0] ])
+    #     y_col.append(report_matrix[i][ getKeysByValue(element_dict, "y")[0] ])
+    #     z_col.append(report_matrix[i][ getKeysByValue(element_dict, "z")[0] ])
+    #     certainty_col.append(report_matrix[i][ getKeysByValue(element_dict, "certainty")[0] ])
 
     # Collect the elements of each upper body part
-    x_col, y_col, z_col, certainty_col = [], [], [], []
-    for i in list(map(int, body_25_upper_body_parts_LR_order_of_appearance)):
-        x_col.append(report_matrix[i][ getKeysByValue(element_dict, "x")[0] ][0:stat_analysis_idx])
-        y_col.append(report_matrix[i][ getKeysByValue(element_dict, "y")[0] ][0:stat_analysis_idx])
-        z_col.append(report_matrix[i][ getKeysByValue(element_dict, "z")[0] ][0:stat_analysis_idx])
-        certainty_col.append(report_matrix[i][ getKeysByValue(element_dict, "certainty")[0] ][0:stat_analysis_idx])
+    x_col = list(report_matrix[ body_25_upper_body_parts_LR_order, getKeysByValue(element_dict, "x")[0] ])
+    y_col = list(report_matrix[ body_25_upper_body_parts_LR_order, getKeysByValue(element_dict, "y")[0] ])
+    z_col = list(report_matrix[ body_25_upper_body_parts_LR_order, getKeysByValue(element_dict, "z")[0] ])
+    certainty_col = list(report_matrix[ body_25_upper_body_parts_LR_order, getKeysByValue(element_dict, "certainty")[0] ])
 
     # Sanitize collected data
     for i in range(len(x_col)):
@@ -724,13 +692,13 @@ if __name__ == "__main__":
 
     # Trim upper body data to what is not empty
     x_data = [ x_c for x_c in x_col if len(x_c) ]
-    x_x_tick_labels = [ str(i) for i in list(map(int, body_25_upper_body_parts_LR_order_of_appearance)) if i < len(x_col) and len(x_col[i]) ]
+    x_x_tick_labels = [ str(i) for i in body_25_upper_body_parts_LR_order if i < len(x_col) and len(x_col[i]) ]
     y_data = [ y_c for y_c in y_col if len(y_c) ]
-    y_x_tick_labels = [ str(i) for i in list(map(int, body_25_upper_body_parts_LR_order_of_appearance)) if i < len(y_col) and len(y_col[i]) ]
+    y_x_tick_labels = [ str(i) for i in body_25_upper_body_parts_LR_order if i < len(y_col) and len(y_col[i]) ]
     z_data = [ z_c for z_c in z_col if len(z_c) ]
-    z_x_tick_labels = [ str(i) for i in list(map(int, body_25_upper_body_parts_LR_order_of_appearance)) if i < len(z_col) and len(z_col[i]) ]
+    z_x_tick_labels = [ str(i) for i in body_25_upper_body_parts_LR_order if i < len(z_col) and len(z_col[i]) ]
     certainty_data = [ certainty_c for certainty_c in certainty_col if len(certainty_c) ]
-    certainty_x_tick_labels = [ str(i) for i in list(map(int, body_25_upper_body_parts_LR_order_of_appearance)) if i < len(certainty_col) and len(certainty_col[i]) ]
+    certainty_x_tick_labels = [ str(i) for i in body_25_upper_body_parts_LR_order if i < len(certainty_col) and len(certainty_col[i]) ]
 
     # # Re-order data in order of appearance
     # x_x_tick_labels_LR, x_data_LR = reorderList(x_x_tick_labels, body_25_body_parts_LR_order_of_appearance, x_data)
@@ -771,55 +739,55 @@ if __name__ == "__main__":
     #         )
 
     # Do a boxplot for each body parts' element
-    boxplot(    data=x_data_LR,
-                data_label="BODY_25 human pose model body parts",
-                title="Boxplot of x value for all BODY_25 human pose model upper body parts",
-                directory=plots_folder_path,
-                x_tick_labels=[ body_25_body_parts_dict.get(int(i)) for i in x_x_tick_labels_LR ]
-            )
-    boxplot(    data=y_data_LR,
-                data_label="BODY_25 human pose model body parts",
-                title="Boxplot of y value for all BODY_25 human pose model upper body parts",
-                directory=plots_folder_path,
-                x_tick_labels=[ body_25_body_parts_dict.get(int(i)) for i in y_x_tick_labels_LR ]
-            )
-    boxplot(    data=z_data_LR,
-                data_label="BODY_25 human pose model body parts",
-                title="Boxplot of z value for all BODY_25 human pose model upper body parts",
-                directory=plots_folder_path,
-                x_tick_labels=[ body_25_body_parts_dict.get(int(i)) for i in z_x_tick_labels_LR ]
-            )
-    boxplot(    data=certainty_data_LR,
-                data_label="BODY_25 human pose model body parts",
-                title="Boxplot of certainty value for all BODY_25 human pose model upper body parts",
-                directory=plots_folder_path,
-                x_tick_labels=[ body_25_body_parts_dict.get(int(i)) for i in certainty_x_tick_labels_LR ]
-            )
+    plots.add(boxplot, data=x_data_LR,
+                       data_label="BODY_25 human pose model body parts",
+                       title="Boxplot of x value for all BODY_25 human pose model upper body parts",
+                       directory=plots_folder_path,
+                       x_tick_labels=[ body_25_body_parts_dict.get(int(i)) for i in x_x_tick_labels_LR ]
+                   )
+    plots.add(boxplot, data=y_data_LR,
+                       data_label="BODY_25 human pose model body parts",
+                       title="Boxplot of y value for all BODY_25 human pose model upper body parts",
+                       directory=plots_folder_path,
+                       x_tick_labels=[ body_25_body_parts_dict.get(int(i)) for i in y_x_tick_labels_LR ]
+                   )
+    plots.add(boxplot, data=z_data_LR,
+                       data_label="BODY_25 human pose model body parts",
+                       title="Boxplot of z value for all BODY_25 human pose model upper body parts",
+                       directory=plots_folder_path,
+                       x_tick_labels=[ body_25_body_parts_dict.get(int(i)) for i in z_x_tick_labels_LR ]
+                   )
+    plots.add(boxplot, data=certainty_data_LR,
+                       data_label="BODY_25 human pose model body parts",
+                       title="Boxplot of certainty value for all BODY_25 human pose model upper body parts",
+                       directory=plots_folder_path,
+                       x_tick_labels=[ body_25_body_parts_dict.get(int(i)) for i in certainty_x_tick_labels_LR ]
+                   )
 
     # Repeat, with median normalization
     # Collect the elements of each body part
     x_col, y_col, z_col = [], [], []
     for i in range(part):
-        x_col.append(report_matrix[i][ getKeysByValue(element_dict, "x")[0] ][0:stat_analysis_idx])
-        y_col.append(report_matrix[i][ getKeysByValue(element_dict, "y")[0] ][0:stat_analysis_idx])
-        z_col.append(report_matrix[i][ getKeysByValue(element_dict, "z")[0] ][0:stat_analysis_idx])
+        x_col.append(np.array(report_matrix[i][ getKeysByValue(element_dict, "x")[0] ]))
+        y_col.append(np.array(report_matrix[i][ getKeysByValue(element_dict, "y")[0] ]))
+        z_col.append(np.array(report_matrix[i][ getKeysByValue(element_dict, "z")[0] ]))
 
     # # Collect the elements of each upper body part
     # x_col, y_col, z_col = [], [], []
     # for i in list(map(int, body_25_upper_body_parts_LR_order_of_appearance)).sort():
-    #     x_col.append(report_matrix[i][ getKeysByValue(element_dict, "x")[0] ][0:stat_analysis_idx])
-    #     y_col.append(report_matrix[i][ getKeysByValue(element_dict, "y")[0] ][0:stat_analysis_idx])
-    #     z_col.append(report_matrix[i][ getKeysByValue(element_dict, "z")[0] ][0:stat_analysis_idx])
+    #     x_col.append(report_matrix[i][ getKeysByValue(element_dict, "x")[0] ])
+    #     y_col.append(report_matrix[i][ getKeysByValue(element_dict, "y")[0] ])
+    #     z_col.append(report_matrix[i][ getKeysByValue(element_dict, "z")[0] ])
 
     # Perform median normalization to the collected data
     for i in range(len(x_col)):
         for j in range(len(x_col[i])):
             if not np.isnan(x_col[i][j]):
-                x_col[i][j] = x_col[i][j] - report_matrix[i][ getKeysByValue(element_dict, "x")[0] ][mean_idx]
+                x_col[i][j] = x_col[i][j] - statistics["mean"][i][ getKeysByValue(element_dict, "x")[0] ]
             if not np.isnan(y_col[i][j]):
-                y_col[i][j] = y_col[i][j] - report_matrix[i][ getKeysByValue(element_dict, "y")[0] ][mean_idx]
+                y_col[i][j] = y_col[i][j] - statistics["mean"][i][ getKeysByValue(element_dict, "y")[0] ]
             if not np.isnan(z_col[i][j]):
-                z_col[i][j] = z_col[i][j] - report_matrix[i][ getKeysByValue(element_dict, "z")[0] ][mean_idx]
+                z_col[i][j] = z_col[i][j] - statistics["mean"][i][ getKeysByValue(element_dict, "z")[0] ]
 
     # Sanitize collected data
     for i in range(len(x_col)):
@@ -846,18 +814,18 @@ if __name__ == "__main__":
 
     # Trim data to what is not empty or lower body
     y_axis_min_list, y_axis_max_list = [], []
-    x_data = [ x_col[i] for i in body_25_body_parts_dict if i < len(x_col) and len(x_col[i]) and i in list(map(int, body_25_upper_body_parts_LR_order_of_appearance)) ]
+    x_data = [ x_col[i] for i in body_25_body_parts_dict if i < len(x_col) and len(x_col[i]) and body_25_upper_body_parts[i] ]
     y_axis_min_list.append( np.nanmin( [ np.nanmin(l) for l in x_data ] ) )
     y_axis_max_list.append( np.nanmax( [ np.nanmax(l) for l in x_data ] ) )
-    x_x_tick_labels = [ str(i) for i in body_25_body_parts_dict if i < len(x_col) and len(x_col[i]) and i in list(map(int, body_25_upper_body_parts_LR_order_of_appearance)) ]
-    y_data = [ y_col[i] for i in body_25_body_parts_dict if i < len(y_col) and len(y_col[i]) and i in list(map(int, body_25_upper_body_parts_LR_order_of_appearance)) ]
+    x_x_tick_labels = [ str(i) for i in body_25_body_parts_dict if i < len(x_col) and len(x_col[i]) and body_25_upper_body_parts[i] ]
+    y_data = [ y_col[i] for i in body_25_body_parts_dict if i < len(y_col) and len(y_col[i]) and body_25_upper_body_parts[i] ]
     y_axis_min_list.append( np.nanmin( [ np.nanmin(l) for l in y_data ] ) )
     y_axis_max_list.append( np.nanmax( [ np.nanmax(l) for l in y_data ] ) )
-    y_x_tick_labels = [ str(i) for i in body_25_body_parts_dict if i < len(y_col) and len(y_col[i]) and i in list(map(int, body_25_upper_body_parts_LR_order_of_appearance)) ]
-    z_data = [ z_col[i] for i in body_25_body_parts_dict if i < len(z_col) and len(z_col[i]) and i in list(map(int, body_25_upper_body_parts_LR_order_of_appearance)) ]
+    y_x_tick_labels = [ str(i) for i in body_25_body_parts_dict if i < len(y_col) and len(y_col[i]) and body_25_upper_body_parts[i] ]
+    z_data = [ z_col[i] for i in body_25_body_parts_dict if i < len(z_col) and len(z_col[i]) and body_25_upper_body_parts[i] ]
     y_axis_min_list.append( np.nanmin( [ np.nanmin(l) for l in z_data ] ) )
     y_axis_max_list.append( np.nanmax( [ np.nanmax(l) for l in z_data ] ) )
-    z_x_tick_labels = [ str(i) for i in body_25_body_parts_dict if i < len(z_col) and len(z_col[i]) and i in list(map(int, body_25_upper_body_parts_LR_order_of_appearance)) ]
+    z_x_tick_labels = [ str(i) for i in body_25_body_parts_dict if i < len(z_col) and len(z_col[i]) and body_25_upper_body_parts[i] ]
     y_axis_min = np.nanmin(y_axis_min_list)
     y_axis_max = np.nanmax(y_axis_max_list)
 
@@ -871,19 +839,8 @@ if __name__ == "__main__":
     y_x_tick_labels_LR, y_data_LR = reorderList(y_x_tick_labels, body_25_upper_body_parts_LR_order_of_appearance, y_data)
     z_x_tick_labels_LR, z_data_LR = reorderList(z_x_tick_labels, body_25_upper_body_parts_LR_order_of_appearance, z_data)
 
-    # Simulate a boxplot for each body parts' element to find mins and maxes of caps
-    mins, maxes = [], []
-    new_y_axis_min, new_y_axis_max = simboxplot(data=x_data_LR)
-    mins.append(new_y_axis_min)
-    maxes.append(new_y_axis_max)
-    new_y_axis_min, new_y_axis_max = simboxplot(data=y_data_LR)
-    mins.append(new_y_axis_min)
-    maxes.append(new_y_axis_max)
-    new_y_axis_min, new_y_axis_max = simboxplot(data=z_data_LR)
-    mins.append(new_y_axis_min)
-    maxes.append(new_y_axis_max)
-    y_axis_min = np.nanmin(mins)
-    y_axis_max = np.nanmax(maxes)
+    # Find the mins and maxes of the caps of every body parts' element boxplot at once
+    y_axis_min, y_axis_max = stats_engine.whiskerLimits(x_data_LR + y_data_LR + z_data_LR)
     
     # # Do a boxplot for each body parts' element
     # boxplot(    data=x_data_LR,
@@ -912,96 +869,90 @@ if __name__ == "__main__":
     #         )
     
     # Do a boxplot for each upper body parts' element
-    boxplot(    data=x_data_LR,
-                data_label="BODY_25 human pose model body parts",
-                title="Boxplot of x value for all BODY_25 human pose model upper body parts after median normalization",
-                directory=plots_folder_path,
-                x_tick_labels=[ body_25_body_parts_dict.get(int(i)) for i in x_x_tick_labels_LR ],
-                y_lim_min=y_axis_min, y_lim_max=y_axis_max,
-                optimize_lims=True
-            )
-    boxplot(    data=y_data_LR,
-                data_label="BODY_25 human pose model body parts",
-                title="Boxplot of y value for all BODY_25 human pose model upper body parts after median normalization",
-                directory=plots_folder_path,
-                x_tick_labels=[ body_25_body_parts_dict.get(int(i)) for i in y_x_tick_labels_LR ],
-                y_lim_min=y_axis_min, y_lim_max=y_axis_max,
-                optimize_lims=True
-            )
-    boxplot(    data=z_data_LR,
-                data_label="BODY_25 human pose model body parts",
-                title="Boxplot of z value for all BODY_25 human pose model upper body parts after median normalization",
-                directory=plots_folder_path,
-                x_tick_labels=[ body_25_body_parts_dict.get(int(i)) for i in z_x_tick_labels_LR ],
-                y_lim_min=y_axis_min, y_lim_max=y_axis_max,
-                optimize_lims=True
-            )
+    plots.add(boxplot, data=x_data_LR,
+                       data_label="BODY_25 human pose model body parts",
+                       title="Boxplot of x value for all BODY_25 human pose model upper body parts after median normalization",
+                       directory=plots_folder_path,
+                       x_tick_labels=[ body_25_body_parts_dict.get(int(i)) for i in x_x_tick_labels_LR ],
+                       y_lim_min=y_axis_min, y_lim_max=y_axis_max,
+                       optimize_lims=True
+                   )
+    plots.add(boxplot, data=y_data_LR,
+                       data_label="BODY_25 human pose model body parts",
+                       title="Boxplot of y value for all BODY_25 human pose model upper body parts after median normalization",
+                       directory=plots_folder_path,
+                       x_tick_labels=[ body_25_body_parts_dict.get(int(i)) for i in y_x_tick_labels_LR ],
+                       y_lim_min=y_axis_min, y_lim_max=y_axis_max,
+                       optimize_lims=True
+                   )
+    plots.add(boxplot, data=z_data_LR,
+                       data_label="BODY_25 human pose model body parts",
+                       title="Boxplot of z value for all BODY_25 human pose model upper body parts after median normalization",
+                       directory=plots_folder_path,
+                       x_tick_labels=[ body_25_body_parts_dict.get(int(i)) for i in z_x_tick_labels_LR ],
+                       y_lim_min=y_axis_min, y_lim_max=y_axis_max,
+                       optimize_lims=True
+                   )
 
 
     # Plot certainty accross frames
     # first, for each body part individually
     for i in range(part):
-        plot(   x=[ j for j in range(stat_analysis_idx) ],
-                y=certainty_accross_frames[i],
-                x_label="Frame",
-                y_label=body_25_body_parts_dict.get(i) + " certainty",
-                title="Plot of " + body_25_body_parts_dict.get(i) + " certainty accross frames",
-                directory=plots_folder_path
-            )
+        plots.add(plot, x=[ j for j in range(logs) ],
+                        y=certainty_accross_frames[i],
+                        x_label="Frame",
+                        y_label=body_25_body_parts_dict.get(i) + " certainty",
+                        title="Plot of " + body_25_body_parts_dict.get(i) + " certainty accross frames",
+                        directory=plots_folder_path
+                    )
     # second, for all body part pairs
     for pair in body_25_body_part_pairs:
-        plot(   x=certainty_accross_frames[pair[0]],
-                y=certainty_accross_frames[pair[1]],
-                x_label=body_25_body_parts_dict.get(pair[0]) + " certainty",
-                y_label=body_25_body_parts_dict.get(pair[1]) + " certainty",
-                title="Plot of " + body_25_body_parts_dict.get(pair[0]) + " and " + body_25_body_parts_dict.get(pair[1]) + " certainty accross frames",
-                directory=plots_folder_path
-            )
+        plots.add(plot, x=certainty_accross_frames[pair[0]],
+                        y=certainty_accross_frames[pair[1]],
+                        x_label=body_25_body_parts_dict.get(pair[0]) + " certainty",
+                        y_label=body_25_body_parts_dict.get(pair[1]) + " certainty",
+                        title="Plot of " + body_25_body_parts_dict.get(pair[0]) + " and " + body_25_body_parts_dict.get(pair[1]) + " certainty accross frames",
+                        directory=plots_folder_path
+                    )
     # third, for all body parts collectivelly
     y_data_list = certainty_accross_frames
     names_list = [ body_25_body_parts_dict.get(i) for i in range(part) ]
     bubbleSortParallelLists(mean_certainty_accross_frames, y_data_list, names_list)
-    multiplot(  x=[ i for i in range(stat_analysis_idx) ],
-                y_data=y_data_list,
-                y_names=names_list,
-                y_lim_min=0.0,
-                y_lim_max=1.0,
-                x_label="Frame",
-                y_label="Body parts certainty",
-                title="Plot of body parts certainty accross frames",
-                directory=plots_folder_path
-            )
+    plots.add(multiplot, x=[ i for i in range(logs) ],
+                         y_data=y_data_list,
+                         y_names=names_list,
+                         y_lim_min=0.0,
+                         y_lim_max=1.0,
+                         x_label="Frame",
+                         y_label="Body parts certainty",
+                         title="Plot of body parts certainty accross frames",
+                         directory=plots_folder_path
+                     )
 
 
     # Do a scatterplot for all body part pairs detected in space
     for pair in body_25_body_part_pairs:
-        if (~np.isnan(report_matrix[ pair[0] ][0][0:stat_analysis_idx])).sum(0) and (~np.isnan(report_matrix[ pair[0] ][1][0:stat_analysis_idx])).sum(0) and (~np.isnan(report_matrix[ pair[0] ][2][0:stat_analysis_idx])).sum(0) and (~np.isnan(report_matrix[ pair[1] ][0][0:stat_analysis_idx])).sum(0) and (~np.isnan(report_matrix[ pair[1] ][1][0:stat_analysis_idx])).sum(0) and (~np.isnan(report_matrix[ pair[1] ][2][0:stat_analysis_idx])).sum(0):
-            x1 = np.array(report_matrix[ pair[0] ][0][0:stat_analysis_idx])[~np.isnan(report_matrix[ pair[0] ][0][0:stat_analysis_idx])]
-            y1 = np.array(report_matrix[ pair[0] ][1][0:stat_analysis_idx])[~np.isnan(report_matrix[ pair[0] ][1][0:stat_analysis_idx])]
-            z1 = np.array(report_matrix[ pair[0] ][2][0:stat_analysis_idx])[~np.isnan(report_matrix[ pair[0] ][2][0:stat_analysis_idx])]
-            x2 = np.array(report_matrix[ pair[1] ][0][0:stat_analysis_idx])[~np.isnan(report_matrix[ pair[1] ][0][0:stat_analysis_idx])]
-            y2 = np.array(report_matrix[ pair[1] ][1][0:stat_analysis_idx])[~np.isnan(report_matrix[ pair[1] ][1][0:stat_analysis_idx])]
-            z2 = np.array(report_matrix[ pair[1] ][2][0:stat_analysis_idx])[~np.isnan(report_matrix[ pair[1] ][2][0:stat_analysis_idx])]
-            multiscatterplot3D( data=[[x1, y1, z1], [x2, y2, z2]],
-                                x_label='X'+label_postfix, y_label='Y'+label_postfix, z_label='Z'+label_postfix,
-                                title="Scatterplot of X"+label_postfix+", Y"+label_postfix+", Z"+label_postfix+" at "+body_25_body_parts_dict.get(pair[0])+" and "+body_25_body_parts_dict.get(pair[1])+" pair",
-                                directory=plots_folder_path,
-                                x_lim_min=np.min([np.min(x1), np.min(x2)]), x_lim_max=np.max([np.max(x1), np.max(x2)]),
-                                y_lim_min=np.min([np.min(y1), np.min(y2)]), y_lim_max=np.max([np.max(y1), np.max(y2)]),
-                                z_lim_min=np.min([np.min(z1), np.min(z2)]), z_lim_max=np.max([np.max(z1), np.max(z2)]),
-                                names=[body_25_body_parts_dict.get(pair[0]), body_25_body_parts_dict.get(pair[1])]
-                            )
+        if (~np.isnan(report_matrix[ pair[0] ][0])).sum(0) and (~np.isnan(report_matrix[ pair[0] ][1])).sum(0) and (~np.isnan(report_matrix[ pair[0] ][2])).sum(0) and (~np.isnan(report_matrix[ pair[1] ][0])).sum(0) and (~np.isnan(report_matrix[ pair[1] ][1])).sum(0) and (~np.isnan(report_matrix[ pair[1] ][2])).sum(0):
+            x1, y1, z1 = observedSeries(report_matrix[ pair[0] ][0:3])
+            x2, y2, z2 = observedSeries(report_matrix[ pair[1] ][0:3])
+            plots.add(multiscatterplot3D, data=[[x1, y1, z1], [x2, y2, z2]],
+                                          x_label='X'+label_postfix, y_label='Y'+label_postfix, z_label='Z'+label_postfix,
+                                          title="Scatterplot of X"+label_postfix+", Y"+label_postfix+", Z"+label_postfix+" at "+body_25_body_parts_dict.get(pair[0])+" and "+body_25_body_parts_dict.get(pair[1])+" pair",
+                                          directory=plots_folder_path,
+                                          x_lim_min=np.min([np.min(x1), np.min(x2)]), x_lim_max=np.max([np.max(x1), np.max(x2)]),
+                                          y_lim_min=np.min([np.min(y1), np.min(y2)]), y_lim_max=np.max([np.max(y1), np.max(y2)]),
+                                          z_lim_min=np.min([np.min(z1), np.min(z2)]), z_lim_max=np.max([np.max(z1), np.max(z2)]),
+                                          names=[body_25_body_parts_dict.get(pair[0]), body_25_body_parts_dict.get(pair[1])]
+                                      )
 
 
     # Do a scatterplot for all body parts detected in space
     data, names, x_mins, x_maxes, y_mins, y_maxes, z_mins, z_maxes, data_means = [], [], [], [], [], [], [], [], []
     all_data, normal_data = 0, 0
     for i in range(part):
-        if (~np.isnan(report_matrix[i][0][0:stat_analysis_idx])).sum(0) and (~np.isnan(report_matrix[i][1][0:stat_analysis_idx])).sum(0) and (~np.isnan(report_matrix[i][2][0:stat_analysis_idx])).sum(0):
-            if occurences_accross_frames[i] >= max_logs / 3:
-                x = np.array(report_matrix[i][0][0:stat_analysis_idx])[~np.isnan(report_matrix[i][0][0:stat_analysis_idx])]
-                y = np.array(report_matrix[i][1][0:stat_analysis_idx])[~np.isnan(report_matrix[i][1][0:stat_analysis_idx])]
-                z = np.array(report_matrix[i][2][0:stat_analysis_idx])[~np.isnan(report_matrix[i][2][0:stat_analysis_idx])]
+        if (~np.isnan(report_matrix[i][0])).sum(0) and (~np.isnan(report_matrix[i][1])).sum(0) and (~np.isnan(report_matrix[i][2])).sum(0):
+            if occurences_accross_frames[i] >= stream_logs / 3:
+                x, y, z = observedSeries(report_matrix[i][0:3])
                 x_mins.append(np.min(x))
                 x_maxes.append(np.max(x))
                 y_mins.append(np.min(y))
@@ -1016,83 +967,161 @@ if __name__ == "__main__":
     # Add to the scatterplot a skeleton of the means of the body part pairs detected in space
     pair_data = 0
     for pair in body_25_body_part_pairs:
-        if not np.isnan(report_matrix[pair[0]][0][mean_idx]) and not np.isnan(report_matrix[pair[0]][1][mean_idx]) and not np.isnan(report_matrix[pair[0]][2][mean_idx]) and not np.isnan(report_matrix[pair[1]][0][mean_idx]) and not np.isnan(report_matrix[pair[1]][1][mean_idx]) and not np.isnan(report_matrix[pair[1]][2][mean_idx]):
-            if occurences_accross_frames[pair[0]] >= max_logs / 3 and occurences_accross_frames[pair[1]] >= max_logs / 3:
-                data.append([[report_matrix[pair[0]][0][mean_idx], report_matrix[pair[1]][0][mean_idx]], [report_matrix[pair[0]][1][mean_idx], report_matrix[pair[1]][1][mean_idx]], [report_matrix[pair[0]][2][mean_idx], report_matrix[pair[1]][2][mean_idx]]])
+        if not np.isnan(statistics["mean"][pair[0]][0]) and not np.isnan(statistics["mean"][pair[0]][1]) and not np.isnan(statistics["mean"][pair[0]][2]) and not np.isnan(statistics["mean"][pair[1]][0]) and not np.isnan(statistics["mean"][pair[1]][1]) and not np.isnan(statistics["mean"][pair[1]][2]):
+            if occurences_accross_frames[pair[0]] >= stream_logs / 3 and occurences_accross_frames[pair[1]] >= stream_logs / 3:
+                data.append([[statistics["mean"][pair[0]][0], statistics["mean"][pair[1]][0]], [statistics["mean"][pair[0]][1], statistics["mean"][pair[1]][1]], [statistics["mean"][pair[0]][2], statistics["mean"][pair[1]][2]]])
                 names.append(body_25_body_parts_dict.get(pair[0])+" and "+body_25_body_parts_dict.get(pair[1])+" pair")
                 all_data = all_data + 1
                 pair_data = pair_data + 1
 
     # 3D scatterplot
-    multiscatterplot3D( data=data,
-                        x_label='X'+label_postfix, y_label='Y'+label_postfix, z_label='Z'+label_postfix,
-                        title="Scatterplot of X"+label_postfix+", Y"+label_postfix+", Z"+label_postfix+" for all body parts detected in space",
-                        directory=plots_folder_path,
-                        x_lim_min=np.min(x_mins), x_lim_max=np.max(x_maxes),
-                        y_lim_min=np.min(y_mins), y_lim_max=np.max(y_maxes),
-                        z_lim_min=np.min(z_mins), z_lim_max=np.max(z_maxes),
-                        names=names,
-                        border_idx=all_data-pair_data-1
-                    )
+    plots.add(multiscatterplot3D, data=data,
+                                  x_label='X'+label_postfix, y_label='Y'+label_postfix, z_label='Z'+label_postfix,
+                                  title="Scatterplot of X"+label_postfix+", Y"+label_postfix+", Z"+label_postfix+" for all body parts detected in space",
+                                  directory=plots_folder_path,
+                                  x_lim_min=np.min(x_mins), x_lim_max=np.max(x_maxes),
+                                  y_lim_min=np.min(y_mins), y_lim_max=np.max(y_maxes),
+                                  z_lim_min=np.min(z_mins), z_lim_max=np.max(z_maxes),
+                                  names=names,
+                                  border_idx=all_data-pair_data-1
+                              )
 
     # 2D scatterplot
-    multiscatterplot2D( data=data,
-                        x_label='X'+label_postfix, y_label='Y'+label_postfix,
-                        title="Scatterplot of X"+label_postfix+", Y"+label_postfix+" for all body parts detected in space",
-                        directory=plots_folder_path,
-                        x_lim_min=np.min(x_mins), x_lim_max=np.max(x_maxes),
-                        y_lim_min=np.min(y_mins), y_lim_max=np.max(y_maxes),
-                        names=names,
-                        border_idx=all_data-pair_data-1
-                    )
+    plots.add(multiscatterplot2D, data=data,
+                                  x_label='X'+label_postfix, y_label='Y'+label_postfix,
+                                  title="Scatterplot of X"+label_postfix+", Y"+label_postfix+" for all body parts detected in space",
+                                  directory=plots_folder_path,
+                                  x_lim_min=np.min(x_mins), x_lim_max=np.max(x_maxes),
+                                  y_lim_min=np.min(y_mins), y_lim_max=np.max(y_maxes),
+                                  names=names,
+                                  border_idx=all_data-pair_data-1
+                              )
 
      # 3D skeletonplot
-    skeletonplot3D( data=data,
-                    x_label='X'+label_postfix, y_label='Y'+label_postfix, z_label='Z'+label_postfix,
-                    title="Skeleton plot of X"+label_postfix+", Y"+label_postfix+", Z"+label_postfix+" for all body parts detected in space",
-                    directory=plots_folder_path,
-                    x_lim_min=np.min(x_mins), x_lim_max=np.max(x_maxes),
-                    y_lim_min=np.min(y_mins), y_lim_max=np.max(y_maxes),
-                    z_lim_min=np.min(z_mins), z_lim_max=np.max(z_maxes),
-                    names=names,
-                    border_idx=all_data-pair_data-1
-                )
+    plots.add(skeletonplot3D, data=data,
+                              x_label='X'+label_postfix, y_label='Y'+label_postfix, z_label='Z'+label_postfix,
+                              title="Skeleton plot of X"+label_postfix+", Y"+label_postfix+", Z"+label_postfix+" for all body parts detected in space",
+                              directory=plots_folder_path,
+                              x_lim_min=np.min(x_mins), x_lim_max=np.max(x_maxes),
+                              y_lim_min=np.min(y_mins), y_lim_max=np.max(y_maxes),
+                              z_lim_min=np.min(z_mins), z_lim_max=np.max(z_maxes),
+                              names=names,
+                              border_idx=all_data-pair_data-1
+                          )
 
     # 2D skeletonplot
-    skeletonplot2D( data=data,
-                    x_label='X'+label_postfix, y_label='Y'+label_postfix,
-                    title="Skeleton plot of X"+label_postfix+", Y"+label_postfix+" for all body parts detected in space",
-                    directory=plots_folder_path,
-                    x_lim_min=np.min(x_mins), x_lim_max=np.max(x_maxes),
-                    y_lim_min=np.min(y_mins), y_lim_max=np.max(y_maxes),
-                    names=names,
-                    border_idx=all_data-pair_data-1
-                )
+    plots.add(skeletonplot2D, data=data,
+                              x_label='X'+label_postfix, y_label='Y'+label_postfix,
+                              title="Skeleton plot of X"+label_postfix+", Y"+label_postfix+" for all body parts detected in space",
+                              directory=plots_folder_path,
+                              x_lim_min=np.min(x_mins), x_lim_max=np.max(x_maxes),
+                              y_lim_min=np.min(y_mins), y_lim_max=np.max(y_maxes),
+                              names=names,
+                              border_idx=all_data-pair_data-1
+                          )
 
     # write statistical analysis report
-    for i in range(part):
+    for i in (range(part) if export_csvs else []):
         # write in the appropriate CSV
         with open(csv_folder_path + body_25_body_parts_dict.get(i) + ".csv", 'a') as fp:
-            print >> fp , "elem,t0,t1,t2,t3,t4,t5,t6,t7,t8,t9,nobs,min,max,mean,variance,skewness,kurtosis,std_dev"
+            print >> fp , "elem," + (",".join( "t"+str(e) for e in range(logs) )) + "," + (",".join(statistics_names))
             for j in range(elem):
-                print >> fp , element_dict.get(j) + "," + (",".join( str(e) for e in report_matrix[i][j] ))
+                print >> fp , element_dict.get(j) + "," + (",".join( str(e) for e in report_matrix[i][j] )) + "," + (",".join( str(statistics[name][i][j]) for name in statistics_names ))
 
 
     # report occurences accross frames
     with open(statistics_folder_path + "Statistics.txt", 'w') as fp:
-        print >> fp , "BODY_25 human pose model body part,Occurences accross " + str(stat_analysis_idx) + " log frames"
+        print >> fp , "BODY_25 human pose model body part,Occurences accross " + str(stream_logs) + " log frames"
         for i in range(part):
             print >> fp , body_25_body_parts_dict.get(i) + "," + str(occurences_accross_frames[i])
 
 
     # report z-table
     with open(statistics_folder_path + "z_table.txt", 'w') as fp:
-        print >> fp , "BODY_25 human pose model body part,z-scores accross " + str(stat_analysis_idx) + " log frames" + "\n"
+        print >> fp , "BODY_25 human pose model body part,z-scores accross " + str(logs) + " log frames" + "\n"
         for i in range(part):
             for j in range(elem):
-                print >> fp , body_25_body_parts_dict.get(i) + ":" + element_dict.get(j) + "," + str(z_table[i][j])
+                print >> fp , body_25_body_parts_dict.get(i) + ":" + element_dict.get(j) + "," + str(z_table[i][j].tolist())
 
             print >> fp , "\n"
 
 
-    print "SUCCESS!"
\ No newline at end of file
+    # optionally, write the frames, statistics and z-table to a single archive, labelled along each axis
+    if archive:
+        run_archive.writeArchive(archive_path,
+            dict(frames=report_matrix, statistics=statistics, z_table=z_table, occurences=np.array(occurences_accross_frames)),
+            axes=dict(frames=[ "keypoint", "element", "frame" ], statistics=[ "keypoint", "element" ], z_table=[ "keypoint", "element", "frame" ], occurences=[ "keypoint" ]),
+            labels=dict(keypoint=[ body_25_body_parts_dict.get(i) for i in range(part) ], element=[ element_dict.get(j) for j in range(elem) ], frame=[ os.path.splitext(stamp)[0].strip() for stamp in stamps ])
+        )
+
+
+    # render the plots, in a pool of worker processes if more than one worker is requested
+    plots.render()
+
+
+# Process a take's stream given as an (output_folder_path, stream, options) job, as a pool maps a single argument
+def processJob(job):
+    output_folder_path, stream, options = job
+    processTake(output_folder_path, stream, **options)
+
+
+if __name__ == "__main__":
+    # File I/O specific variables, e.g. the take "take46QueueSize100/" with the prefix "Thu Feb 14 15:16:", or "A-FV-ST-V-C-up/" with "Wed Apr 10 12:1"
+    # output_path = "/home/gkamaras/catkin_ws/src/openpose_ros/openpose_ros_receiver/output/"
+    # output_path = "/home/gkamaras/catkin_ws/src/openpose_ros/openpose_ros_receiver/output/SCENARIOS/ZED_HD720/logs/"
+    output_path = "/home/gkamaras/catkin_ws/src/openpose_ros/openpose_ros_receiver/output/old_takes/"
+
+    parser = argparse.ArgumentParser(description="Process the OP/RAW/TFED log files of one or more takes into CSVs, statistics and plots.")
+    parser.add_argument("takes", nargs="*", default=[ "take24/" ], help="take folders, or glob patterns of them, relative to the output path (default: take24/)")
+    parser.add_argument("--output-path", default=output_path, help="folder of the takes (default: %(default)s)")
+    parser.add_argument("--streams", nargs="+", choices=sorted(streams_dict), default=[ "OP" ], help="log streams to process, from a single scan of each take and with their frames aligned by timestamp (default: OP)")
+    parser.add_argument("--prefix", default="Thu Jan 31 15:3", help="prefix of the log file names after their stream tag, empty for every log file (default: %(default)s)")
+    parser.add_argument("--max-logs", type=int, default=None, help="process only the first MAX_LOGS log files of each stream")
+    parser.add_argument("--start", default=None, help="process only the log files from this time on, e.g. \"Thu Jan 31 15:30:10 2019\"")
+    parser.add_argument("--stop", default=None, help="process only the log files before this time, e.g. \"Thu Jan 31 15:30:30 2019\"")
+    parser.add_argument("--take-workers", type=int, default=multiprocessing.cpu_count(), help="takes' streams processed concurrently, 1 for serially (default: %(default)s)")
+    parser.add_argument("--plot-workers", type=int, default=multiprocessing.cpu_count(), help="processes rendering the plots of a single stream, 1 for serially (default: %(default)s)")
+    parser.add_argument("--stats-only", action="store_true", help="only write the CSVs and statistics, without ever importing the plotting stack")
+    parser.add_argument("--no-plot-cache", dest="plot_cache", action="store_false", help="re-render even the plots whose inputs did not change")
+    parser.add_argument("--archive", action="store_true", help="also write the frames, statistics and z-table of each stream to a single report" + run_archive.archiveExtension() + " file in its statistics folder")
+    parser.add_argument("--no-csvs", dest="export_csvs", action="store_false", help="skip the per-keypoint CSVs, e.g. when the archive replaces them")
+    args = parser.parse_args()
+    start, stop = [ log_index.parseTimestamp(t) if t else None for t in [ args.start, args.stop ] ]
+    if (args.start and start is None) or (args.stop and stop is None):
+        parser.error("times must be formatted like \"Thu Jan 31 15:30:10 2019\"")
+
+    # expand the glob patterns into take folders
+    output_folder_paths = []
+    for take in args.takes:
+        for path in sorted(glob.glob(os.path.join(args.output_path, take))):
+            if os.path.isdir(path) and os.path.join(path, "") not in output_folder_paths:
+                output_folder_paths.append(os.path.join(path, ""))
+    if not output_folder_paths:
+        parser.error("no take folder matches " + " ".join(args.takes) + " in " + args.output_path)
+
+    # scan each take once for all of its streams, whose frames are then aligned by timestamp
+    jobs = []
+    for output_folder_path in output_folder_paths:
+        take_logs = scanTakeLogs(output_folder_path, args.prefix, args.streams, args.max_logs, start, stop)
+        for stream in args.streams:
+            jobs.append( (output_folder_path, stream, dict(plot_workers=args.plot_workers, stats_only=args.stats_only, plot_cache=args.plot_cache, take_logs=take_logs,
+                                                           archive=args.archive, export_csvs=args.export_csvs)) )
+
+    # process several takes' streams concurrently, each rendering its plots serially, as pool workers may not fork in turn
+    if args.take_workers > 1 and len(jobs) > 1:
+        for output_folder_path, stream, options in jobs:
+            options["plot_workers"] = 1
+        # import the plotting stack before forking, so that the workers share it
+        if not args.stats_only:
+            plot_renderer.loadPlotting()
+        pool = multiprocessing.Pool(processes=min(args.take_workers, len(jobs)))
+        try:
+            pool.map(processJob, jobs, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for job in jobs:
+            processJob(job)
+
+    print "SUCCESS!"
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+# python modules
+import os
+import struct
+import zipfile
+import numpy as np
+# write HDF5 archives if h5py is installed, and .npz archives otherwise
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+# local modules
+import log_cache
+
+
+# File extension of the archives that writeArchive writes: HDF5 if h5py is installed, NumPy's .npz otherwise
+def archiveExtension():
+    return ".h5" if h5py is not None else ".npz"
+
+
+# Write named arrays to a single archive file, atomically, along with the names of each array's axes, as "axes/<array>", and the labels
+# of the positions along them, as "labels/<axis>". HDF5 datasets are chunked and compressed, which still reads them partially, while .npz
+# members are only compressed if asked to, since compressed members cannot be memory-mapped
+def writeArchive(path, arrays, axes, labels, compress=False):
+    members = dict(arrays)
+    for name, names in axes.items():
+        members["axes/" + name] = np.array(names)
+    for axis, values in labels.items():
+        members["labels/" + axis] = np.array(values)
+
+    if path.endswith(".h5"):
+        with h5py.File(path + ".tmp", 'w') as archive:
+            for name, array in members.items():
+                array = np.asarray(array)
+                # HDF5 holds fixed length byte strings, not numpy's unicode ones
+                if array.dtype.kind == 'U':
+                    array = np.char.encode(array, 'utf-8')
+                archive.create_dataset(name, data=array, chunks=True if array.ndim else None, compression="gzip" if array.ndim else None)
+        os.rename(path + ".tmp", path)
+    else:
+        log_cache.saveArrays(path, compress, **members)
+
+
+# Memory-map an uncompressed .npz member from its offset in the file, as np.load only maps plain .npy files
+def mapNpzMember(path, info):
+    with open(path, 'rb') as fp:
+        # skip the member's local zip header, whose file name and extra field lengths are its last two fields
+        fp.seek(info.header_offset)
+        name_length, extra_length = struct.unpack("<HH", fp.read(30)[26:30])
+        fp.seek(info.header_offset + 30 + name_length + extra_length)
+        version = np.lib.format.read_magic(fp)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fp)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fp)
+        offset = fp.tell()
+
+    if dtype.hasobject or not np.prod(shape):
+        return np.load(path)[info.filename[:-len(".npy")]]
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape, order='F' if fortran_order else 'C')
+
+
+# Open an archive for partial reads: an open h5py.File, whose datasets read only the slices taken from them, or a {name: array} dictionary
+# of a .npz archive's members, memory-mapped unless they are compressed
+def openArchive(path):
+    if path.endswith(".h5"):
+        return h5py.File(path, 'r')
+
+    members = {}
+    with zipfile.ZipFile(path) as archive:
+        infos = archive.infolist()
+    for info in infos:
+        name = info.filename[:-len(".npy")]
+        if info.compress_type == zipfile.ZIP_STORED:
+            members[name] = mapNpzMember(path, info)
+        else:
+            members[name] = np.load(path)[name]
+    return members
@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+
+# python modules
+import numpy as np
+
+
+# Descriptive statistics reported per body part element, in the column order of the reports
+statistics_names = [ "nobs", "min", "max", "mean", "variance", "skewness", "kurtosis", "std_dev" ]
+statistics_dtype = np.dtype([ ("nobs", np.int64), ("min", np.float64), ("max", np.float64), ("mean", np.float64),
+                              ("variance", np.float64), ("skewness", np.float64), ("kurtosis", np.float64), ("std_dev", np.float64) ])
+
+
+# Turn observation counts, extrema and central moment sums into a structured array of statistics, as scipy.stats.describe and np.std report them
+def momentsToStatistics(nobs, minimum, maximum, mean, m2, m3, m4):
+    n = np.asarray(nobs, dtype=np.float64)
+    observed = n > 0
+    # treat round-off sized second moments of constant series as zero, as scipy does for exact zeros
+    zero = m2 <= n * (np.finfo(np.float64).eps * np.maximum(np.abs(mean), 1.0)) ** 2 * 16
+
+    statistics = np.empty(n.shape, dtype=statistics_dtype)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        statistics["nobs"] = nobs
+        statistics["min"] = np.where(observed, minimum, np.nan)
+        statistics["max"] = np.where(observed, maximum, np.nan)
+        statistics["mean"] = np.where(observed, mean, np.nan)
+        statistics["variance"] = np.where(n > 1, m2 / (n - 1), np.nan)
+        statistics["skewness"] = np.where(observed, np.where(zero, 0.0, np.sqrt(n) * m3 / m2 ** 1.5), np.nan)
+        statistics["kurtosis"] = np.where(observed, np.where(zero, 0.0, n * m4 / m2 ** 2) - 3.0, np.nan)
+        statistics["std_dev"] = np.where(observed, np.sqrt(np.where(zero, 0.0, m2) / n), np.nan)
+
+    return statistics
+
+
+# Compute every descriptive statistic of a NaN-masked tensor along one axis with whole-array reductions
+def describeTensor(data, axis=-1):
+    data = np.asarray(data, dtype=np.float64)
+    valid = ~np.isnan(data)
+
+    nobs = valid.sum(axis=axis)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(valid, data, 0.0).sum(axis=axis) / nobs
+    deviation = np.where(valid, data - np.expand_dims(mean, axis), 0.0)
+    m2 = (deviation ** 2).sum(axis=axis)
+    m3 = (deviation ** 3).sum(axis=axis)
+    m4 = (deviation ** 4).sum(axis=axis)
+    minimum = np.where(valid, data, np.inf).min(axis=axis)
+    maximum = np.where(valid, data, -np.inf).max(axis=axis)
+
+    return momentsToStatistics(nobs, minimum, maximum, mean, m2, m3, m4)
+
+
+# Compute the z-scores of a NaN-masked tensor against its statistics along one axis, NaN wherever they are undefined
+def zTable(data, statistics, axis=-1):
+    data = np.asarray(data, dtype=np.float64)
+    mean = np.expand_dims(statistics["mean"], axis)
+    std_dev = np.expand_dims(statistics["std_dev"], axis)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(std_dev > 0, (data - mean) / std_dev, np.nan)
+
+
+# Linearly interpolated quantile of each row of a sorted [series][observation] array with nobs leading observations per row, as np.percentile computes it
+def sortedQuantile(ordered, nobs, q):
+    position = np.maximum(nobs - 1, 0) * q
+    below = np.floor(position).astype(np.intp)
+    above = np.minimum(below + 1, np.maximum(nobs - 1, 0))
+    weight = position - below
+    rows = np.arange(len(ordered))
+    return ordered[rows, below] * (1 - weight) + ordered[rows, above] * weight
+
+
+# Tukey whisker caps of many series at once, as matplotlib's boxplot draws them: the most extreme observations within whis * IQR of the quartiles, NaN for empty series
+def whiskerCaps(data, whis=1.5):
+    lengths = [ len(series) for series in data ]
+    ordered = np.full((len(data), max(lengths + [1])), np.nan)
+    for s, series in enumerate(data):
+        ordered[s, :lengths[s]] = series
+    # NaNs sort last, so that each row starts with its observations in order
+    ordered.sort(axis=1)
+    nobs = (~np.isnan(ordered)).sum(axis=1)
+
+    with np.errstate(invalid='ignore'):
+        q1, q3 = sortedQuantile(ordered, nobs, 0.25), sortedQuantile(ordered, nobs, 0.75)
+        iqr = q3 - q1
+        low = np.where(ordered >= (q1 - whis * iqr)[:, np.newaxis], ordered, np.inf).min(axis=1)
+        high = np.where(ordered <= (q3 + whis * iqr)[:, np.newaxis], ordered, -np.inf).max(axis=1)
+        # the whiskers never fall inside the box
+        return np.minimum(low, q1), np.maximum(high, q3)
+
+
+# Axis limits that fit the whisker caps of every series, None if no series has observations
+def whiskerLimits(data, whis=1.5):
+    low, high = whiskerCaps(data, whis)
+    if np.isnan(low).all():
+        return None, None
+    return np.nanmin(low), np.nanmax(high)
+
+
+# Deviations of a NaN-masked tensor from its means along one axis, zero where observations are missing, and the largest magnitude of each series
+def centeredSeries(data, axis=-1):
+    data = np.asarray(data, dtype=np.float64)
+    valid = ~np.isnan(data)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(valid, data, 0.0).sum(axis=axis, keepdims=True) / valid.sum(axis=axis, keepdims=True)
+    return np.where(valid, data - mean, 0.0), np.where(valid, np.abs(data), 0.0).max(axis=axis, keepdims=True)
+
+
+# Autocorrelation of every series of a NaN-masked tensor along one axis, as pandas' autocorrelation_plot computes it, with one zero-padded FFT
+# instead of a product per lag; missing observations deviate by zero from the mean and constant series are NaN
+def autocorrelationTensor(data, axis=-1):
+    deviation, scale = centeredSeries(data, axis)
+    n = deviation.shape[axis]
+    # pad to a power of two of at least 2n - 1 points, so that the circular correlation does not wrap around
+    size = 1 << max(2 * n - 2, 0).bit_length()
+
+    spectrum = np.fft.rfft(deviation, size, axis=axis)
+    covariance = np.take(np.fft.irfft(spectrum * spectrum.conj(), size, axis=axis), np.arange(n), axis=axis)
+    variance = np.take(covariance, [0], axis=axis)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(variance > n * (np.finfo(np.float64).eps * np.maximum(scale, 1.0)) ** 2 * 16, covariance / variance, np.nan)
+
+
+# One-sided power spectral density of every series of a NaN-masked tensor along one axis, sampled at sample_rate, and the frequencies of its bins
+def powerSpectrumTensor(data, sample_rate=1.0, axis=-1):
+    deviation, _ = centeredSeries(data, axis)
+    n = deviation.shape[axis]
+    power = np.abs(np.fft.rfft(deviation, axis=axis)) ** 2 / (sample_rate * n)
+
+    # fold the negative frequencies onto the positive ones, all but the DC and Nyquist bins which have no mirror
+    folding = np.full(n // 2 + 1, 2.0)
+    folding[0] = 1.0
+    if n % 2 == 0:
+        folding[-1] = 1.0
+    shape = [ 1 ] * power.ndim
+    shape[axis] = -1
+
+    return np.fft.rfftfreq(n, 1.0 / sample_rate), power * folding.reshape(shape)
+
+
+# Frequency of the strongest non-DC bin of every power spectrum along one axis, NaN for flat or too short series
+def dominantFrequency(frequencies, power, axis=-1):
+    power = np.take(power, np.arange(1, len(frequencies)), axis=axis)
+    if power.shape[axis] == 0:
+        return np.full(np.delete(power.shape, axis % power.ndim), np.nan)
+    return np.where(power.max(axis=axis) > 0, frequencies[1:][power.argmax(axis=axis)], np.nan)
+
+
+# Histograms of every series of a NaN-masked [...][observation] tensor on the same bins, spanning all of their observations, and the bin edges
+def histogramTensor(data, bins=10):
+    data = np.asarray(data, dtype=np.float64)
+    valid = ~np.isnan(data)
+    low, high = (data[valid].min(), data[valid].max()) if valid.any() else (0.0, 1.0)
+    # widen an empty range by half a unit each way, as np.histogram does
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    edges = np.linspace(low, high, bins + 1)
+
+    # count every series at once, offsetting the bin of each observation by its series' position
+    series = np.arange(data[..., 0].size).reshape(data.shape[:-1] + (1,)) * bins
+    positions = np.clip(np.searchsorted(edges, np.where(valid, data, low), side='right') - 1, 0, bins - 1)
+    counts = np.bincount((series + positions)[valid], minlength=data[..., 0].size * bins)
+    return counts.reshape(data.shape[:-1] + (bins,)), edges
+
+
+# Gaussian kernel density estimates of every series of a NaN-masked [...][observation] tensor, with Scott's bandwidth as pandas' KDE plots use it,
+# each on a grid of points spanning its observations and half their range beyond, by linear binning and one batched FFT convolution;
+# series with a single value, whose bandwidth would be zero, are smoothed with degenerate_bandwidth instead, and empty series are NaN
+def densityTensor(data, points=1024, degenerate_bandwidth=1.0):
+    data = np.asarray(data, dtype=np.float64)
+    shape = data.shape[:-1]
+    data = data.reshape(-1, data.shape[-1])
+    valid = ~np.isnan(data)
+    nobs = valid.sum(axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        low = np.where(valid, data, np.inf).min(axis=1)
+        high = np.where(valid, data, -np.inf).max(axis=1)
+        mean = np.where(valid, data, 0.0).sum(axis=1) / nobs
+        std_dev = np.sqrt((np.where(valid, data - mean[:, np.newaxis], 0.0) ** 2).sum(axis=1) / (nobs - 1))
+        bandwidth = std_dev * nobs ** -0.2
+        degenerate = ~(bandwidth > 0) | (high == low)
+    bandwidth = np.where(degenerate, degenerate_bandwidth, bandwidth)
+    margin = np.where(degenerate, 4 * degenerate_bandwidth, (high - low) / 2)
+    start, step = np.nan_to_num(low - margin), np.where(nobs > 0, (high - low + 2 * margin) / (points - 1), 1.0)
+    grid = start[:, np.newaxis] + np.arange(points) * step[:, np.newaxis]
+
+    # spread each observation over its two nearest grid points, in proportion to its proximity to them
+    position = np.where(valid, (data - start[:, np.newaxis]) / step[:, np.newaxis], 0.0)
+    below = np.clip(np.floor(position).astype(np.intp), 0, points - 2)
+    weight = np.where(valid, position - below, 0.0)
+    offsets = np.arange(len(data))[:, np.newaxis] * points + below
+    counts = np.bincount(offsets[valid], (1 - weight)[valid], minlength=len(data) * points) + \
+             np.bincount(offsets[valid] + 1, weight[valid], minlength=len(data) * points)
+
+    # convolve with each series' Gaussian kernel as a product with its Fourier transform, padded so that the tails do not wrap around
+    size = 2 * points
+    frequencies = np.fft.rfftfreq(size)
+    kernel = np.exp(-2 * (np.pi * frequencies[np.newaxis, :] * (bandwidth / step)[:, np.newaxis]) ** 2)
+    smoothed = np.fft.irfft(np.fft.rfft(counts.reshape(len(data), points), size, axis=1) * kernel, size, axis=1)[:, :points]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        density = np.where((nobs > 0)[:, np.newaxis], np.maximum(smoothed, 0.0) / (nobs * step)[:, np.newaxis], np.nan)
+    return grid.reshape(shape + (points,)), density.reshape(shape + (points,)), bandwidth.reshape(shape)
+
+
+# Summarize many series of NaN-masked errors at once, [...][observation]: their observation counts, mean and median errors, the errors at each percentile,
+# [...][percentile], and the rates of observations within each radius, [...][radius], as the PCK metric counts hits; NaN for empty series
+def errorSummary(errors, percentiles=(), radii=()):
+    errors = np.asarray(errors, dtype=np.float64)
+    shape = errors.shape[:-1]
+    # NaNs sort last, so that each row starts with its observations in order
+    ordered = np.sort(errors.reshape(-1, errors.shape[-1]), axis=1)
+    nobs = (~np.isnan(ordered)).sum(axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(np.isnan(ordered), 0.0, ordered).sum(axis=1) / nobs
+        quantiles = [ np.where(nobs > 0, sortedQuantile(ordered, nobs, q), np.nan) for q in [ 0.5 ] + [ p / 100.0 for p in percentiles ] ]
+        hit_rates = [ np.where(nobs > 0, (ordered <= radius).sum(axis=1) / nobs.astype(np.float64), np.nan) for radius in radii ]
+
+    return nobs.reshape(shape), mean.reshape(shape), quantiles[0].reshape(shape), \
+           np.stack(quantiles[1:], axis=-1).reshape(shape + (len(percentiles),)) if percentiles else np.empty(shape + (0,)), \
+           np.stack(hit_rates, axis=-1).reshape(shape + (len(radii),)) if radii else np.empty(shape + (0,))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+
+# python modules
+import numpy as np
+
+# local modules
+import stats_engine
+
+
+# Growable [frame][...] array stored in fixed-size chunks, so that appending frames never copies the ones already stored
+class ChunkedArray(object):
+
+    def __init__(self, shape, chunk_size=1024, dtype=np.float64):
+        self.shape = tuple(shape)
+        self.chunk_size = chunk_size
+        self.dtype = dtype
+        self.chunks = []
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    # Append a block of frames, shaped [frame][...]
+    def append(self, block):
+        block = np.asarray(block, dtype=self.dtype)
+        start = 0
+        while start < block.shape[0]:
+            offset = self.length % self.chunk_size
+            if not offset:
+                self.chunks.append(np.full((self.chunk_size,) + self.shape, np.nan, dtype=self.dtype))
+            count = min(self.chunk_size - offset, block.shape[0] - start)
+            self.chunks[-1][offset:offset+count] = block[start:start+count]
+            self.length = self.length + count
+            start = start + count
+
+    # Return the stored frames as one contiguous [frame][...] ndarray
+    def toArray(self):
+        if not self.chunks:
+            return np.full((0,) + self.shape, np.nan, dtype=self.dtype)
+        return np.concatenate(self.chunks)[0:self.length]
+
+
+# NaN-aware streaming nobs/min/max and central moments per element of a [...] shape, merged block by block (Welford/Pebay update)
+class StreamingMoments(object):
+
+    def __init__(self, shape):
+        self.nobs = np.zeros(shape, dtype=np.int64)
+        self.min = np.full(shape, np.nan)
+        self.max = np.full(shape, np.nan)
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+        self.m3 = np.zeros(shape)
+        self.m4 = np.zeros(shape)
+
+    # Merge a block of frames, shaped [frame][...], into the accumulated moments
+    def update(self, block):
+        block = np.asarray(block, dtype=np.float64)
+        if not block.shape[0]:
+            return
+        valid = ~np.isnan(block)
+
+        # moments of the block on its own
+        n_b = valid.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_b = np.where(n_b > 0, np.where(valid, block, 0.0).sum(axis=0) / n_b, 0.0)
+        deviation = np.where(valid, block - mean_b, 0.0)
+        m2_b = (deviation ** 2).sum(axis=0)
+        m3_b = (deviation ** 3).sum(axis=0)
+        m4_b = (deviation ** 4).sum(axis=0)
+
+        # merge them with the accumulated ones
+        n_a = self.nobs.astype(np.float64)
+        n_b = n_b.astype(np.float64)
+        n = n_a + n_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = mean_b - self.mean
+            mean = np.where(n > 0, self.mean + delta * n_b / n, 0.0)
+            m2 = self.m2 + m2_b + delta ** 2 * n_a * n_b / n
+            m3 = self.m3 + m3_b + delta ** 3 * n_a * n_b * (n_a - n_b) / n ** 2 + 3.0 * delta * (n_a * m2_b - n_b * self.m2) / n
+            m4 = self.m4 + m4_b + delta ** 4 * n_a * n_b * (n_a ** 2 - n_a * n_b + n_b ** 2) / n ** 3 \
+                 + 6.0 * delta ** 2 * (n_a ** 2 * m2_b + n_b ** 2 * self.m2) / n ** 2 + 4.0 * delta * (n_a * m3_b - n_b * self.m3) / n
+        updated = n > 0
+        self.mean = mean
+        self.m2 = np.where(updated, m2, 0.0)
+        self.m3 = np.where(updated, m3, 0.0)
+        self.m4 = np.where(updated, m4, 0.0)
+        self.nobs = self.nobs + n_b.astype(np.int64)
+
+        with np.errstate(invalid='ignore'):
+            self.min = np.fmin(self.min, np.nanmin(np.where(valid, block, np.inf), axis=0))
+            self.max = np.fmax(self.max, np.nanmax(np.where(valid, block, -np.inf), axis=0))
+        self.min[~updated] = np.nan
+        self.max[~updated] = np.nan
+
+    # Return the descriptive statistics of the accumulated data as a stats_engine structured array
+    def statistics(self):
+        return stats_engine.momentsToStatistics(self.nobs, self.min, self.max, self.mean, self.m2, self.m3, self.m4)